@@ -134,49 +134,55 @@ class HumanBehavior:
         # クリック後の微小な待機
         time.sleep(random.uniform(0.1, 0.2))
     
-    def command_click(self, coords: Tuple[int, int]):
+    def command_click(self, coords: Tuple[int, int], wait: float = 3.0):
         """
         中クリック（新タブで開く）- デバッグ情報付き
         Args:
             coords: クリック座標
+            wait: タブ移動前の待機秒数（呼び出し側でページ表示を待つ場合は短くしてよい）。
+                  タブ移動後の待機も最大1秒までこの値に合わせる
         """
         # 座標の微小なランダム化
         x = coords[0] + random.randint(-2, 2)
         y = coords[1] + random.randint(-2, 2)
         
         # デバッグ: クリック前の状態確認
-        self.logger.info(f"=== 中クリック開始 ===")
-        self.logger.info(f"元座標: {coords}, 実際座標: ({x}, {y})")
+        self.logger.info("=== 中クリック開始 ===")
+        self.logger.info("元座標: %s, 実際座標: (%s, %s)", coords, x, y)
         
         # 現在のマウス位置を記録
         current_x, current_y = pyautogui.position()
-        self.logger.info(f"クリック前マウス位置: ({current_x}, {current_y})")
+        self.logger.info("クリック前マウス位置: (%s, %s)", current_x, current_y)
         
         # 自然な移動
         self.move_mouse_naturally(x, y)
         
         # 移動後の位置確認
         after_x, after_y = pyautogui.position()
-        self.logger.info(f"移動後マウス位置: ({after_x}, {after_y})")
+        self.logger.info("移動後マウス位置: (%s, %s)", after_x, after_y)
         
         # クリック前の微小な待機
         time.sleep(random.uniform(0.05, 0.15))
         
         # 中クリック実行
-        self.logger.info(f"中クリック実行: button='middle'")
+        self.logger.info("中クリック実行: button='middle'")
         pyautogui.click(x, y, button='middle')
-        self.logger.info(f"中クリック送信完了")
+        self.logger.info("中クリック送信完了")
         
         # 新タブ作成確認のための待機
-        time.sleep(3.0)
+        time.sleep(wait)
         
         # 新しいタブにフォーカス移動
-        self.focus_new_tab()
+        self.focus_new_tab(settle=min(wait, 1.0))
         
-        self.logger.info(f"=== 中クリック完了 ===")
+        self.logger.info("=== 中クリック完了 ===")
     
-    def focus_new_tab(self):
-        """新しく開いたタブにフォーカスを移動 - 物理キー対応"""
+    def focus_new_tab(self, settle: float = 1.0):
+        """
+        新しく開いたタブにフォーカスを移動 - 物理キー対応
+        Args:
+            settle: タブ切り替えキー送信後の待機秒数
+        """
         self.logger.info("タブ移動開始")
         
         # Mac/Windows共通：物理的なControl+Tab
@@ -190,7 +196,7 @@ class HumanBehavior:
             pyautogui.keyUp('ctrl')
             self.logger.info("Control+Tab (物理キー) 実行")
             
-            time.sleep(1)
+            time.sleep(settle)
             
             # 成功確認
             if self._verify_new_tab():
@@ -205,7 +211,7 @@ class HumanBehavior:
             pyautogui.keyUp('ctrl')
             self.logger.info("Control+PageDown 実行")
             
-            time.sleep(1)
+            time.sleep(settle)
             
         except Exception as e:
             self.logger.error(f"タブ移動エラー: {e}")
@@ -216,28 +222,48 @@ class HumanBehavior:
         """新しいタブに移動できたか確認"""
         try:
             cmd_key = self.get_cmd_key()
+            # 前のタブでコピーしたURLを読まないよう空にしてからコピー
+            pyperclip.copy('')
             pyautogui.hotkey(cmd_key, 'l')
-            time.sleep(0.3)
             pyautogui.hotkey(cmd_key, 'c')
-            time.sleep(0.3)
-            current_url = pyperclip.paste()
+            current_url = self._wait_clipboard(timeout=1.0)
             
             # メルカリ商品ページのURLパターンをチェック
             is_product_page = '/item/' in current_url or 'mercari.com' in current_url
-            self.logger.debug(f"URL確認: {current_url[:50]}... 商品ページ: {is_product_page}")
+            self.logger.debug("URL確認: %s... 商品ページ: %s", current_url[:50], is_product_page)
             return is_product_page
         except Exception as e:
             self.logger.error(f"タブ確認エラー: {e}")
             return False
     
-    def close_current_tab(self):
+    def _wait_clipboard(self, timeout: float) -> str:
+        """
+        クリップボードに値が入るまで待機（固定待機せず、更新された時点で戻る）
+        Args:
+            timeout: 最大待機時間（秒）
+        Returns:
+            クリップボードの内容（タイムアウト時は空文字）
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            text = pyperclip.paste()
+            if text or time.monotonic() >= deadline:
+                return text
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+    
+    def close_current_tab(self, wait: float = 1.0):
         """
         現在のタブを閉じる（OS別対応）
+        Args:
+            wait: タブが閉じるまでの待機秒数（呼び出し側で画面変化を待つ場合は0）
         """
         cmd_key = self.get_cmd_key()
         pyautogui.hotkey(cmd_key, 'w')  # Mac: command+w, Windows: ctrl+w
-        time.sleep(1)  # タブが閉じるまで待機
-        self.logger.debug(f"タブを閉じました（{cmd_key}+w）")
+        if wait > 0:
+            time.sleep(wait)  # タブが閉じるまで待機
+        self.logger.debug("タブを閉じました（%s+w）", cmd_key)
     
     def double_click(self, coords: Tuple[int, int]):
         """ダブルクリック"""
@@ -253,13 +279,20 @@ class HumanBehavior:
         time.sleep(interval)
         pyautogui.click(x, y)
     
-    def type_like_human(self, text: str, typos: bool = True):
+    def type_like_human(self, text: str, typos: bool = True, fast: bool = False):
         """
         人間らしいタイピング
         Args:
             text: 入力テキスト
             typos: タイプミスを含めるか
+            fast: Trueの場合はクリップボード経由で一括貼り付け
+                  （スプレッドシート等、人間らしさが不要な画面用）
         """
+        if fast:
+            pyperclip.copy(text)
+            pyautogui.hotkey(self.get_cmd_key(), 'v')
+            return
+        
         for char in text:
             # タイプミス判定
             if typos and self.typo_corrections and random.random() < self.typo_probability:
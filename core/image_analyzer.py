@@ -7,19 +7,106 @@
 """
 
 import cv2
+import hashlib
+import heapq
+import json
 import numpy as np
+import os
 from pathlib import Path
-import json
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Tuple, Dict, Optional, List
 import logging
 
+from utils.json_io import load_json
+
+try:
+    from numba import njit
+except ImportError:  # numba未導入時はnumpyで判定
+    njit = None
+
+# バーコード判定で縦線強度を平均する帯の高さ（px）
+BARCODE_BAND_HEIGHT = 30
+
+# 判定ロジックの版（判定結果が変わる変更をしたら上げる。判別キャッシュが破棄される）
+ANALYZER_VERSION = 1
+
+
+def _has_barcode_band_numpy(lines: np.ndarray, band: int) -> bool:
+    """
+    縦線強度マップに、等間隔のピークが10個を超えて並ぶ帯があるか判定（numpy版）
+    Args:
+        lines: 縦線強度（2次元）
+        band: 平均する帯の高さ
+    Returns:
+        バーコードらしい帯があればTrue
+    """
+    h, w = lines.shape
+    if h <= band or w < 3:
+        return False
+    
+    # 累積和から全ての帯の列方向平均を一括計算
+    cum = np.zeros((h + 1, w), dtype=np.float64)
+    np.cumsum(lines, axis=0, dtype=np.float64, out=cum[1:])
+    profiles = (cum[band:h] - cum[:h - band]) / band
+    
+    # 両隣より大きい点をピークとする
+    mid = profiles[:, 1:-1]
+    peaks = (mid > profiles[:, :-2]) & (mid > profiles[:, 2:])
+    for y in np.nonzero(peaks.sum(axis=1) > 10)[0]:
+        intervals = np.diff(np.nonzero(peaks[y])[0])
+        mean_interval = intervals.mean()
+        if mean_interval > 0 and intervals.std() / mean_interval < 0.3:
+            return True
+    return False
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _has_barcode_band(lines, band):
+        """縦線強度マップに、等間隔のピークが10個を超えて並ぶ帯があるか判定（JIT版）"""
+        h, w = lines.shape
+        if h <= band or w < 3:
+            return False
+        
+        # 帯の列方向合計（1行ずつずらしながら更新）
+        sums = np.zeros(w, dtype=np.float64)
+        for y in range(band):
+            for x in range(w):
+                sums[x] += lines[y, x]
+        
+        peaks = np.empty(w, dtype=np.int64)
+        for y in range(h - band):
+            if y > 0:
+                for x in range(w):
+                    sums[x] += lines[y + band - 1, x] - lines[y - 1, x]
+            
+            n = 0
+            for x in range(1, w - 1):
+                if sums[x] > sums[x - 1] and sums[x] > sums[x + 1]:
+                    peaks[n] = x
+                    n += 1
+            
+            if n > 10:
+                mean_interval = (peaks[n - 1] - peaks[0]) / (n - 1)
+                var = 0.0
+                for k in range(n - 1):
+                    d = (peaks[k + 1] - peaks[k]) - mean_interval
+                    var += d * d
+                std_interval = np.sqrt(var / (n - 1))
+                if mean_interval > 0 and std_interval / mean_interval < 0.3:
+                    return True
+        return False
+else:
+    _has_barcode_band = _has_barcode_band_numpy
+
 
 class ImageAnalyzer:
     """画像分析クラス"""
 
     def __init__(self, config_path: str = "config/config.json"):
+        self.config_path = config_path
         self.setup_logging()
         self.load_config(config_path)
         self.setup_directories()
@@ -45,8 +132,7 @@ class ImageAnalyzer:
     def load_config(self, config_path: str):
         try:
             if Path(config_path).exists():
-                with open(config_path, "r", encoding="utf-8") as f:
-                    self.config = json.load(f)
+                self.config = load_json(config_path)
             else:
                 self.config = {}
                 self.logger.warning(f"設定ファイルなし: {config_path}、デフォルト設定を使用")
@@ -54,6 +140,13 @@ class ImageAnalyzer:
             self.logger.error(f"設定読み込みエラー: {e}")
             self.config = {}
 
+    @property
+    def cache_version(self) -> str:
+        """判別キャッシュの版（判定ロジックの版と設定内容から作成。どちらかが変われば別の値）"""
+        config = json.dumps(self.config, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.blake2b(config.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{ANALYZER_VERSION}:{digest}"
+
     def setup_directories(self):
         required_dirs = [
             "data/images/mercari_ok",
@@ -64,6 +157,13 @@ class ImageAnalyzer:
         for d in required_dirs:
             Path(d).mkdir(parents=True, exist_ok=True)
 
+    def warmup(self):
+        """JITコンパイル（numba導入時）を最初の分析の前に済ませる"""
+        try:
+            _has_barcode_band(np.zeros((BARCODE_BAND_HEIGHT + 2, 8), dtype=np.float32), BARCODE_BAND_HEIGHT)
+        except Exception as e:
+            self.logger.debug(f"ウォームアップスキップ: {e}")
+
     # -------------------------
     # 画像読み込み/正規化
     # -------------------------
@@ -83,28 +183,69 @@ class ImageAnalyzer:
             except Exception as e:
                 self.logger.debug(f"EXIF処理スキップ: {e}")
 
-            # リサイズ
-            h, w = img.shape[:2]
-            max_side = max(h, w)
-            max_size = (
-                self.config.get("image_analysis", {})
-                .get("max_image_size", 1280)
-            )
-            if max_side > max_size:
-                scale = max_size / max_side
-                img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
-
-            return img
+            return self._limit_size(img)
         except Exception as e:
             raise ValueError(f"画像正規化エラー: {str(e)}")
 
+    def _limit_size(self, img: np.ndarray) -> np.ndarray:
+        """長辺が max_image_size を超える場合は縮小"""
+        h, w = img.shape[:2]
+        max_side = max(h, w)
+        max_size = (
+            self.config.get("image_analysis", {})
+            .get("max_image_size", 1280)
+        )
+        if max_side > max_size:
+            scale = max_size / max_side
+            img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        return img
+
     # -------------------------
     # 公開API
     # -------------------------
     def analyze_single_image(self, image_path: str) -> Dict:
-        result = {
-            "file_path": image_path,
-            "file_name": Path(image_path).name,
+        result = self._new_result(image_path, Path(image_path).name)
+
+        try:
+            image = self._read_and_normalize(image_path)
+        except Exception as e:
+            result["error"] = f"分析エラー: {str(e)}"
+            self.logger.error(f"画像分析エラー: {e}")
+            return result
+        
+        return self._score_image(image, result)
+
+    def analyze_image_array(self, image: np.ndarray, filename: str = "memory_image") -> Dict:
+        """
+        RPA用：BGR配列を analyze_single_image と同じ基準で分析（PNGの保存・読み込みを省く）
+        Args:
+            image: BGR画像配列（キャプチャ結果）
+            filename: 結果に記録する名前
+        Returns:
+            analyze_single_image と同じ形式の結果（file_path はNone、source は"memory"）
+        """
+        result = self._new_result(None, filename)
+        result["source"] = "memory"
+        
+        if image is None or image.size == 0:
+            result["error"] = "無効な画像データ"
+            return result
+        
+        return self._score_image(self._limit_size(image), result)
+
+    @staticmethod
+    def _new_result(file_path: Optional[str], file_name: str) -> Dict:
+        """
+        判定前の結果辞書を作成
+        Args:
+            file_path: 画像ファイルのパス（メモリ上の画像はNone）
+            file_name: 結果に記録する名前
+        Returns:
+            未判定（NG・0点）の結果辞書
+        """
+        return {
+            "file_path": file_path,
+            "file_name": file_name,
             "timestamp": datetime.now().isoformat(),
             "is_business": False,
             "score": 0,
@@ -114,12 +255,23 @@ class ImageAnalyzer:
             "error": None
         }
 
+    def _score_image(self, image: np.ndarray, result: Dict) -> Dict:
+        """
+        正規化済み画像を採点して result に書き込む
+        Args:
+            image: BGR画像（サイズ制限済み）
+            result: 結果辞書（file_name等は設定済み）
+        Returns:
+            結果辞書
+        """
         try:
-            image = self._read_and_normalize(image_path)
-            
             # 基礎スコア
             base_score = 50
             
+            # Canny(50,150)の輪郭と面積は複数の検出器で共有
+            contours = self._find_edge_contours(image)
+            areas = self._contour_areas(contours)
+            
             # =========================================
             # 第0段階: 白背景の事前判定
             # =========================================
@@ -128,7 +280,7 @@ class ImageAnalyzer:
             # =========================================
             # 第1段階: プロ撮影特徴を先に評価（優先）
             # =========================================
-            pro_score, pro_reason = self._detect_professional_features_v2(image)
+            pro_score, pro_reason = self._detect_professional_features_v2(image, contours, areas)
             if pro_score > 0.6:
                 bonus = int(pro_score * 40)
                 base_score += bonus
@@ -163,7 +315,7 @@ class ImageAnalyzer:
             # =========================================
             # 第3段階: ROI抽出によるパッケージ判定
             # =========================================
-            roi_result = self._extract_and_analyze_roi(image)
+            roi_result = self._extract_and_analyze_roi(image, contours, areas)
             if roi_result["has_roi"] and roi_result["package_face_score"] > 0.6:
                 penalty = int(roi_result["package_face_score"] * 35)
                 base_score -= penalty
@@ -189,7 +341,7 @@ class ImageAnalyzer:
             # =========================================
             # 第5段階: ブリスターパック検出
             # =========================================
-            blister_score, blister_reason = self._detect_blister_pack(image)
+            blister_score, blister_reason = self._detect_blister_pack(image, contours, areas)
             if blister_score > 0.5:
                 penalty = int(blister_score * 25)
                 base_score -= penalty
@@ -221,9 +373,9 @@ class ImageAnalyzer:
                     "reason": "新方式のため省略"
                 }
 
-            self.logger.info(f"画像判定完了: {Path(image_path).name}")
-            self.logger.info(f"  総合スコア: {result['score']}点 (閾値: {self.business_threshold})")
-            self.logger.info(f"  判定結果: {'業者(OK)' if result['is_business'] else '個人(NG)'}")
+            self.logger.info("画像判定完了: %s", result['file_name'])
+            self.logger.info("  総合スコア: %s点 (閾値: %s)", result['score'], self.business_threshold)
+            self.logger.info("  判定結果: %s", '業者(OK)' if result['is_business'] else '個人(NG)')
             return result
 
         except Exception as e:
@@ -231,77 +383,12 @@ class ImageAnalyzer:
             self.logger.error(f"画像分析エラー: {e}")
             return result
 
-    def analyze_image_array(self, image: np.ndarray, filename: str = "memory_image") -> Dict:
-        """RPA用：numpy配列からの分析"""
-        result = {
-            "file_name": filename,
-            "timestamp": datetime.now().isoformat(),
-            "is_business": False,
-            "score": 0,
-            "details": {},
-            "reasons": [],
-            "rule_results": {},
-            "error": None,
-            "source": "memory"
-        }
-        try:
-            if image is None or image.size == 0:
-                result["error"] = "無効な画像データ"
-                return result
-
-            h, w = image.shape[:2]
-            max_side = max(h, w)
-            max_size = self.config.get("image_analysis", {}).get("max_image_size", 1280)
-            if max_side > max_size:
-                scale = max_size / max_side
-                image = cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
-
-            base_score = 50
-            is_white_bg = self._is_white_background(image)
-            
-            # プロ撮影特徴
-            pro_score, pro_reason = self._detect_professional_features_v2(image)
-            if pro_score > 0.6:
-                bonus = int(pro_score * 40)
-                base_score += bonus
-                result["reasons"].append(f"プロ撮影: {pro_reason}")
-                skip_personal_bg = pro_score > 0.8
-            else:
-                skip_personal_bg = False
-            
-            # 個人背景検出
-            if not skip_personal_bg and not is_white_bg:
-                personal_bg_score, bg_reason = self._detect_personal_background_v2(image)
-                if personal_bg_score > 0.8:
-                    penalty = int(personal_bg_score * 30)
-                    base_score -= penalty
-                    result["reasons"].append(f"個人撮影背景: {bg_reason}")
-            
-            # ROI判定
-            roi_result = self._extract_and_analyze_roi(image)
-            if roi_result["has_roi"] and roi_result["package_face_score"] > 0.6:
-                penalty = int(roi_result["package_face_score"] * 35)
-                base_score -= penalty
-                result["reasons"].append(f"パッケージ面検出: {roi_result['reason']}")
-            
-            result["score"] = max(0, min(100, base_score))
-            result["is_business"] = result["score"] >= self.business_threshold
-            
-            # 互換性のための詳細情報
-            result["details"]["商品実物チェック"] = {"score": 0, "max_score": 30, "reason": "総合判定"}
-            result["details"]["撮影品質チェック"] = {"score": 0, "max_score": 20, "reason": "ROI判定"}
-            result["details"]["販売努力チェック"] = {"score": 0, "max_score": 0, "reason": "省略"}
-            
-            return result
-
-        except Exception as e:
-            result["error"] = f"メモリ画像分析エラー: {str(e)}"
-            self.logger.error(f"メモリ画像分析エラー: {e}")
-            return result
-
     def process_and_save_image(self, image_path: str) -> Dict:
         """分析して OK/NG フォルダへ移動/コピー"""
-        result = self.analyze_single_image(image_path)
+        return self._save_by_result(image_path, self.analyze_single_image(image_path))
+
+    def _save_by_result(self, image_path: str, result: Dict) -> Dict:
+        """分析結果に応じて OK/NG フォルダへ移動/コピー"""
         try:
             source_path = Path(image_path)
             if not source_path.exists():
@@ -328,6 +415,29 @@ class ImageAnalyzer:
             self.logger.error(f"ファイル処理エラー: {e}")
         return result
 
+    def analyze_batch(self, image_paths: List[str], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        複数画像をプロセスプールでまとめて分析（ファイル移動は行わない）
+        Args:
+            image_paths: 画像パスのリスト
+            max_workers: ワーカープロセス数（Noneならコア数）
+        Returns:
+            image_paths と同じ順序の分析結果リスト
+        """
+        if len(image_paths) < 2:
+            return [self.analyze_single_image(path) for path in image_paths]
+        workers = max_workers or os.cpu_count() or 1
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=init_analyzer_worker,
+                                     initargs=(self.config_path,)) as pool:
+                # 1件ずつ送るとプロセス間通信が増えるため数件ずつまとめて渡す
+                chunksize = max(1, len(image_paths) // (4 * workers))
+                return list(pool.map(analyze_in_worker, image_paths, chunksize=chunksize))
+        except Exception as e:
+            self.logger.warning(f"並列分析に失敗したため逐次分析します: {e}")
+            return [self.analyze_single_image(path) for path in image_paths]
+
     def batch_analyze(self, image_folder: str) -> List[Dict]:
         folder_path = Path(image_folder)
         if not folder_path.exists():
@@ -336,11 +446,32 @@ class ImageAnalyzer:
         exts = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
         files = [p for p in folder_path.iterdir() if p.is_file() and p.suffix.lower() in exts]
         self.logger.info(f"一括分析開始: {len(files)}ファイル")
-        results = [self.process_and_save_image(str(p)) for p in files]
+        paths = [str(p) for p in files]
+        # 分析は複数プロセスでまとめて行い、移動/コピーは順番に行う
+        results = [self._save_by_result(path, result)
+                   for path, result in zip(paths, self.analyze_batch(paths))]
         ok_count = sum(1 for r in results if r.get("is_business"))
         self.logger.info(f"一括分析完了: OK={ok_count}, NG={len(results)-ok_count}")
         return results
 
+    # =========================================
+    # 共有特徴量
+    # =========================================
+    def _find_edge_contours(self, image: np.ndarray) -> list:
+        """Canny(50,150)エッジの外側輪郭（切り抜き/ROI/二層構造で共有）"""
+        try:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            edges = cv2.Canny(gray, 50, 150)
+            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            return list(contours)
+        except Exception as e:
+            self.logger.debug(f"輪郭抽出エラー: {e}")
+            return []
+
+    def _contour_areas(self, contours: list) -> np.ndarray:
+        """輪郭面積を一括計算（面積フィルタはブールインデックスで行う）"""
+        return np.array([cv2.contourArea(c) for c in contours], dtype=np.float64)
+
     # =========================================
     # 第0段階: 白背景の事前判定
     # =========================================
@@ -598,16 +729,22 @@ class ImageAnalyzer:
     # =========================================
     # 第2段階: 改善版プロ撮影特徴検出
     # =========================================
-    def _safe_detect(self, detect_func, image):
+    def _safe_detect(self, detect_func, image, *args):
         """安全な特徴検出（例外をキャッチ）"""
         try:
-            return detect_func(image)
+            return detect_func(image, *args)
         except Exception as e:
             self.logger.debug(f"{detect_func.__name__} 例外: {e}")
             return 0.0
     
-    def _detect_professional_features_v2(self, image: np.ndarray) -> Tuple[float, str]:
+    def _detect_professional_features_v2(self, image: np.ndarray,
+                                         contours: Optional[list] = None,
+                                         areas: Optional[np.ndarray] = None) -> Tuple[float, str]:
         """改善版：プロ撮影特徴の検出（異種2項目ゲート）"""
+        if contours is None:
+            contours = self._find_edge_contours(image)
+        if areas is None:
+            areas = self._contour_areas(contours)
         background_scores = {}
         composition_scores = {}
         reasons = []
@@ -659,7 +796,7 @@ class ImageAnalyzer:
                 reasons.append(f"プロ影: {shadow_quality:.1%}")
         
         # 7. 商品の切り抜き感
-        cutout_quality = self._safe_detect(self._detect_cutout_quality, image)
+        cutout_quality = self._safe_detect(self._detect_cutout_quality, image, contours, areas)
         if cutout_quality > 0:
             composition_scores["cutout"] = cutout_quality
             if cutout_quality > 0.4:
@@ -921,27 +1058,28 @@ class ImageAnalyzer:
             self.logger.debug(f"クリーン背景検出エラー: {e}")
             return 0.0
     
-    def _detect_cutout_quality(self, image: np.ndarray) -> float:
+    def _detect_cutout_quality(self, image: np.ndarray, contours: Optional[list] = None,
+                               areas: Optional[np.ndarray] = None) -> float:
         """商品の切り抜き感を検出"""
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # エッジの鮮明さ
-            edges = cv2.Canny(gray, 50, 150)
-            
-            # 輪郭の滑らかさ
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # エッジ輪郭（共有済みでなければ計算）
+            if contours is None:
+                contours = self._find_edge_contours(image)
             
             if not contours:
                 return 0.0
             
+            if areas is None:
+                areas = self._contour_areas(contours)
+            
             # 最大輪郭
-            largest_contour = max(contours, key=cv2.contourArea)
+            largest_idx = int(np.argmax(areas))
+            largest_contour = contours[largest_idx]
             
             # 輪郭の滑らかさ（凸包との差）
             hull = cv2.convexHull(largest_contour)
             hull_area = cv2.contourArea(hull)
-            contour_area = cv2.contourArea(largest_contour)
+            contour_area = float(areas[largest_idx])
             
             if hull_area > 0:
                 smoothness = contour_area / hull_area
@@ -971,14 +1109,11 @@ class ImageAnalyzer:
             edges = cv2.Canny(gray, 30, 100)
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
-            # 一定サイズ以上の物体
-            significant_objects = []
+            # 一定サイズ以上の物体（画像の2%以上）
             total_area = gray.shape[0] * gray.shape[1]
-            
-            for cnt in contours:
-                area = cv2.contourArea(cnt)
-                if area > total_area * 0.02:  # 画像の2%以上
-                    significant_objects.append(cnt)
+            areas = self._contour_areas(contours)
+            significant_idx = np.nonzero(areas > total_area * 0.02)[0]
+            significant_objects = [contours[i] for i in significant_idx]
             
             if len(significant_objects) >= 3:
                 # 物体の配置パターンを確認
@@ -1108,7 +1243,8 @@ class ImageAnalyzer:
     # =========================================
     # 既存メソッド（ROI、パッケージ、ブリスター）
     # =========================================
-    def _extract_and_analyze_roi(self, image: np.ndarray) -> Dict:
+    def _extract_and_analyze_roi(self, image: np.ndarray, contours: Optional[list] = None,
+                                 areas: Optional[np.ndarray] = None) -> Dict:
         """最大矩形領域を抽出してパッケージ面を判定"""
         result = {
             "has_roi": False,
@@ -1118,23 +1254,25 @@ class ImageAnalyzer:
         }
         
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            h, w = gray.shape
+            h, w = image.shape[:2]
             image_area = h * w
             
-            edges = cv2.Canny(gray, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if contours is None:
+                contours = self._find_edge_contours(image)
             
             if not contours:
                 return result
             
+            if areas is None:
+                areas = self._contour_areas(contours)
+            
             best_roi = None
             best_score = 0
             
-            for cnt in contours:
-                area = cv2.contourArea(cnt)
-                if area < image_area * 0.1:
-                    continue
+            # 画像の10%未満の輪郭は除外
+            for i in np.nonzero(areas >= image_area * 0.1)[0]:
+                cnt = contours[i]
+                area = float(areas[i])
                 
                 epsilon = 0.02 * cv2.arcLength(cnt, True)
                 approx = cv2.approxPolyDP(cnt, epsilon, True)
@@ -1283,24 +1421,8 @@ class ImageAnalyzer:
             vertical_lines = cv2.filter2D(gray, cv2.CV_32F, kernel)
             vertical_lines = np.abs(vertical_lines)
             
-            h, w = vertical_lines.shape
-            for y in range(0, h - 30):
-                region = vertical_lines[y:y+30, :]
-                profile = np.mean(region, axis=0)
-                
-                peaks = []
-                for i in range(1, len(profile) - 1):
-                    if profile[i] > profile[i-1] and profile[i] > profile[i+1]:
-                        peaks.append(i)
-                
-                if len(peaks) > 10:
-                    intervals = [peaks[i+1] - peaks[i] for i in range(len(peaks)-1)]
-                    if intervals:
-                        std_interval = np.std(intervals)
-                        mean_interval = np.mean(intervals)
-                        if mean_interval > 0 and std_interval / mean_interval < 0.3:
-                            return 1.0
-            
+            if _has_barcode_band(vertical_lines, BARCODE_BAND_HEIGHT):
+                return 1.0
             return 0.0
             
         except Exception as e:
@@ -1432,7 +1554,8 @@ class ImageAnalyzer:
             self.logger.debug(f"矩形レイアウト検出エラー: {e}")
             return 0.0
 
-    def _detect_blister_pack(self, image: np.ndarray) -> Tuple[float, str]:
+    def _detect_blister_pack(self, image: np.ndarray, contours: Optional[list] = None,
+                             areas: Optional[np.ndarray] = None) -> Tuple[float, str]:
         """ブリスターパック（透明包装）の検出"""
         scores = []
         reasons = []
@@ -1447,7 +1570,7 @@ class ImageAnalyzer:
             scores.append(plastic_reflection)
             reasons.append(f"プラ反射: {plastic_reflection:.1%}")
         
-        two_layer = self._detect_two_layer_structure(image)
+        two_layer = self._detect_two_layer_structure(image, contours, areas)
         if two_layer > 0.4:
             scores.append(two_layer)
             reasons.append("二層構造")
@@ -1526,28 +1649,29 @@ class ImageAnalyzer:
             self.logger.debug(f"プラ反射検出エラー: {e}")
             return 0.0
     
-    def _detect_two_layer_structure(self, image: np.ndarray) -> float:
+    def _detect_two_layer_structure(self, image: np.ndarray, contours: Optional[list] = None,
+                                    areas: Optional[np.ndarray] = None) -> float:
         """台紙＋商品の二層構造検出"""
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            edges = cv2.Canny(gray, 50, 150)
-            
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            if len(contours) < 2:
+            if contours is None:
+                contours = self._find_edge_contours(image)
+            if areas is None:
+                areas = self._contour_areas(contours)
+            
+            # 上位2つだけ必要なので全体ソートはしない
+            top2 = heapq.nlargest(2, range(len(contours)), key=areas.__getitem__)
+            if len(top2) < 2:
                 return 0.0
+            c0, c1 = contours[top2[0]], contours[top2[1]]
             
-            contours = sorted(contours, key=cv2.contourArea, reverse=True)
+            area1 = areas[top2[0]]
+            area2 = areas[top2[1]]
             
-            area1 = cv2.contourArea(contours[0])
-            area2 = cv2.contourArea(contours[1])
-            
-            total_area = gray.shape[0] * gray.shape[1]
+            total_area = image.shape[0] * image.shape[1]
             
             if area1 > total_area * 0.2 and area2 > total_area * 0.1:
-                rect1 = cv2.boundingRect(contours[0])
-                rect2 = cv2.boundingRect(contours[1])
+                rect1 = cv2.boundingRect(c0)
+                rect2 = cv2.boundingRect(c1)
                 
                 x_overlap = max(0, min(rect1[0] + rect1[2], rect2[0] + rect2[2]) - max(rect1[0], rect2[0]))
                 y_overlap = max(0, min(rect1[1] + rect1[3], rect2[1] + rect2[3]) - max(rect1[1], rect2[1]))
@@ -1561,4 +1685,43 @@ class ImageAnalyzer:
             
         except Exception as e:
             self.logger.debug(f"二層構造検出エラー: {e}")
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+# =========================================
+# ワーカープロセス用（ProcessPoolExecutorのinitializer/タスク）
+# =========================================
+_worker_analyzer: Optional[ImageAnalyzer] = None
+
+
+def init_analyzer_worker(config_path: str = "config/config.json"):
+    """ワーカープロセスで分析器を1度だけ初期化（設定読み込み・JITコンパイル）"""
+    global _worker_analyzer
+    _worker_analyzer = ImageAnalyzer(config_path)
+    _worker_analyzer.warmup()
+
+
+def analyze_in_worker(image_path: str) -> Dict:
+    """
+    ワーカープロセス内の分析器で画像を分析
+    Args:
+        image_path: 画像ファイルのパス
+    Returns:
+        analyze_single_image の結果
+    """
+    if _worker_analyzer is None:
+        init_analyzer_worker()
+    return _worker_analyzer.analyze_single_image(image_path)
+
+
+def analyze_array_in_worker(image: np.ndarray, filename: str = "capture") -> Dict:
+    """
+    ワーカープロセス内の分析器でBGR配列を分析
+    Args:
+        image: BGR画像配列
+        filename: 結果に記録する名前
+    Returns:
+        analyze_image_array の結果
+    """
+    if _worker_analyzer is None:
+        init_analyzer_worker()
+    return _worker_analyzer.analyze_image_array(image, filename)
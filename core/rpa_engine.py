@@ -4,12 +4,121 @@ RPA基盤エンジン
 """
 import pyautogui
 import time
-from typing import Tuple, Optional, Dict
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait as futures_wait
+from typing import Tuple, Optional, Dict, Union
 from pathlib import Path
 import cv2
 import numpy as np
+from PIL import Image
 from utils.logger import setup_logger
 
+try:
+    import mss
+except ImportError:  # mss未導入時はpyautoguiで代替
+    mss = None
+
+try:
+    from numba import njit
+except ImportError:  # numba未導入時はnumpyで判定
+    njit = None
+
+# テンプレートマッチングのピラミッド段数（1段ごとに1/2縮小）
+PYRAMID_LEVELS = 2
+# ピラミッド縮小後もテンプレートがこのサイズ未満にならないよう段数を制限
+MIN_TEMPLATE_SIDE = 16
+
+
+@functools.lru_cache(maxsize=64)
+def _load_template(image_path: str) -> Tuple[np.ndarray, ...]:
+    """
+    テンプレート画像を読み込みガウシアンピラミッドを作成（キャッシュ付き）
+    Args:
+        image_path: テンプレート画像パス
+    Returns:
+        原寸から順に縮小したBGR画像のタプル
+    """
+    template = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if template is None:
+        raise FileNotFoundError(f"テンプレート画像が読み込めません: {image_path}")
+    
+    pyramid = [template]
+    for _ in range(PYRAMID_LEVELS):
+        h, w = pyramid[-1].shape[:2]
+        if min(h, w) // 2 < MIN_TEMPLATE_SIDE:
+            break
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return tuple(pyramid)
+
+
+def _match_template_pyramid(screen: np.ndarray, pyramid: Tuple[np.ndarray, ...],
+                            max_diff: float) -> Optional[Tuple[int, int]]:
+    """
+    ピラミッドの最粗段で候補を探し、原寸では候補周辺のみ再照合
+    Args:
+        screen: 検索対象のBGR画像
+        pyramid: _load_template の戻り値
+        max_diff: TM_SQDIFF_NORMED の許容値（小さいほど厳密）
+    Returns:
+        screen内の一致位置の中心座標
+    """
+    # 画面側のピラミッド
+    screens = [screen]
+    for _ in range(len(pyramid) - 1):
+        screens.append(cv2.pyrDown(screens[-1]))
+    
+    coarse_screen, coarse_tmpl = screens[-1], pyramid[-1]
+    if (coarse_screen.shape[0] < coarse_tmpl.shape[0]
+            or coarse_screen.shape[1] < coarse_tmpl.shape[1]):
+        return None
+    
+    # 最粗段で候補位置を探す（縮小で差分が出るため閾値を緩める）
+    result = cv2.matchTemplate(coarse_screen, coarse_tmpl, cv2.TM_SQDIFF_NORMED)
+    min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+    if min_val > min(max_diff * 2, 1.0):
+        return None
+    
+    # 原寸で候補周辺のみ再照合
+    scale = 2 ** (len(pyramid) - 1)
+    th, tw = pyramid[0].shape[:2]
+    sh, sw = screen.shape[:2]
+    x0 = max(0, min_loc[0] * scale - scale)
+    y0 = max(0, min_loc[1] * scale - scale)
+    x1 = min(sw, min_loc[0] * scale + tw + scale)
+    y1 = min(sh, min_loc[1] * scale + th + scale)
+    window = screen[y0:y1, x0:x1]
+    if window.shape[0] < th or window.shape[1] < tw:
+        return None
+    
+    result = cv2.matchTemplate(window, pyramid[0], cv2.TM_SQDIFF_NORMED)
+    min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+    if min_val > max_diff:
+        return None
+    
+    return x0 + min_loc[0] + tw // 2, y0 + min_loc[1] + th // 2
+
+
+def _region_bright_numpy(region: np.ndarray, thresh: int) -> bool:
+    """領域のRGB合計が閾値を超えるか（numpy版）"""
+    return int(region[:, :, :3].sum(dtype=np.uint32)) > thresh
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _region_bright(region, thresh):
+        """領域のRGB合計が閾値を超えるか（JIT版、アルファチャンネルは無視）"""
+        total = 0
+        h, w, _ = region.shape
+        for i in range(h):
+            for j in range(w):
+                for k in range(3):
+                    total += region[i, j, k]
+        return total > thresh
+else:
+    _region_bright = _region_bright_numpy
+
+
 class RPAEngine:
     """
     RPA基盤クラス
@@ -30,6 +139,27 @@ class RPAEngine:
         
         # 画像認識設定
         self.confidence = 0.8  # 画像マッチング信頼度
+        
+        # mssインスタンスはスレッド間で共有できないため、スレッドごとに保持
+        self._local = threading.local()
+        
+        # スクリーンショットのPNG保存はバックグラウンドで実行
+        self._save_pool = ThreadPoolExecutor(max_workers=1)
+        self._save_lock = threading.Lock()
+        
+        # 要素確認の判定領域（座標±region_size）と明度閾値（平均RGB合計150相当）
+        self.probe_region_size = 10
+        self._brightness_thresh = 150 * (2 * self.probe_region_size) ** 2
+        
+        # JITコンパイルを初回判定の前に済ませておく
+        # （numbaは書き込み可否で別に型特化するため、実際のキャプチャと同じバッファ型で呼ぶ。
+        #   mssは書き込み可能なbytearray、pyautoguiは読み取り専用のbytes）
+        warmup_buf = bytearray(16) if mss is not None else bytes(16)
+        _region_bright(np.frombuffer(warmup_buf, dtype=np.uint8).reshape(2, 2, 4), 0)
+        
+        # 画面差分キャッシュ（前回の領域バッファと判定結果）
+        self._last_region_bytes: Optional[bytes] = None
+        self._last_region_result = False
     
     def wait_for_element(self, coords: Tuple[int, int], timeout: int = 10) -> bool:
         """
@@ -40,38 +170,159 @@ class RPAEngine:
         Returns:
             要素が見つかったらTrue
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        prev_color = None
+        
+        def is_ready() -> bool:
+            nonlocal prev_color
             try:
                 # 座標の色を取得して変化を検出
                 pixel_color = pyautogui.pixel(coords[0], coords[1])
-                # 背景色でないことを確認（簡易チェック）
-                if sum(pixel_color) > 100:  # 黒でない
-                    return True
             except Exception as e:
                 self.logger.debug(f"要素待機エラー: {e}")
-            time.sleep(0.5)
+                return False
+            # 2回連続で同じ色（描画が安定）かつ背景色でない（黒でない）
+            stable = pixel_color == prev_color
+            prev_color = pixel_color
+            return stable and sum(pixel_color) > 100
+        
+        if self._wait_backoff(is_ready, timeout):
+            return True
         
         self.logger.warning(f"要素待機タイムアウト: {coords}")
         return False
     
+    def snapshot_region(self, region: Tuple[int, int, int, int]) -> Optional[bytes]:
+        """
+        領域の現在の表示内容を取得（wait_for_region_settled の比較元用）
+        Args:
+            region: (left, top, width, height)。画面外の部分は切り詰める
+        Returns:
+            キャプチャの生バッファ。取得できない場合はNone（呼び出し側は固定待機に切り替える）
+        """
+        region = self.clamp_region(region)
+        if region is None:
+            return None
+        try:
+            buf, _ = self._grab_region_buffer(*region)
+            return bytes(buf)
+        except Exception as e:
+            self.logger.debug(f"領域取得エラー: {e}")
+            return None
+    
+    def clamp_region(self, region: Tuple[int, int, int, int]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        領域をキャプチャ可能な画面範囲内に切り詰める
+        Args:
+            region: (left, top, width, height)
+        Returns:
+            切り詰めた領域。画面と重ならない場合はNone
+        """
+        left, top, width, height = region
+        screen_left, screen_top, screen_width, screen_height = self._capture_bounds
+        right = min(left + width, screen_left + screen_width)
+        bottom = min(top + height, screen_top + screen_height)
+        left = max(left, screen_left)
+        top = max(top, screen_top)
+        if right <= left or bottom <= top:
+            return None
+        return (left, top, right - left, bottom - top)
+    
+    def wait_for_region_settled(self, region: Tuple[int, int, int, int],
+                                changed_from: Optional[bytes] = None,
+                                require_content: bool = False,
+                                timeout: float = 2.0) -> bool:
+        """
+        領域の描画が落ち着くまで待機（固定sleepの代わりに使用）
+        連続する2回のキャプチャが一致した時点で完了とみなす
+        Args:
+            region: (left, top, width, height)
+            changed_from: 指定した場合、この内容から変化するまでは完了としない
+            require_content: Trueの場合、単色（読み込み前の空白）は完了としない
+            timeout: タイムアウト時間（秒）
+        Returns:
+            タイムアウト前に落ち着いたらTrue
+        """
+        region = self.clamp_region(region)
+        if region is None:
+            time.sleep(timeout)
+            return False
+        prev = None
+        
+        def is_settled() -> bool:
+            nonlocal prev
+            try:
+                buf, shape = self._grab_region_buffer(*region)
+            except Exception as e:
+                self.logger.debug(f"領域待機エラー: {e}")
+                return False
+            if changed_from is not None and buf == changed_from:
+                return False
+            stable = buf == prev
+            prev = buf
+            if not stable:
+                return False
+            if require_content:
+                pixels = np.frombuffer(buf, dtype=np.uint8).reshape(shape)[:, :, :3]
+                return pixels.min() != pixels.max()
+            return True
+        
+        # 描画の途中を「一致」と誤認しないよう、比較間隔は0.1秒から始める
+        if self._wait_backoff(is_settled, timeout, initial_delay=0.1, max_delay=0.3):
+            return True
+        
+        self.logger.debug(f"領域待機タイムアウト: {region}")
+        return False
+    
+    def _wait_backoff(self, predicate, timeout: float,
+                      initial_delay: float = 0.01, max_delay: float = 0.2) -> bool:
+        """
+        指数バックオフで条件成立を待機
+        Args:
+            predicate: 成立したらTrueを返す関数
+            timeout: タイムアウト時間（秒）
+            initial_delay: 初回の待機間隔（秒）
+            max_delay: 待機間隔の上限（秒）
+        Returns:
+            タイムアウト前に成立したらTrue
+        """
+        deadline = time.time() + timeout
+        delay = initial_delay
+        while True:
+            if predicate():
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, max_delay)
+    
     def find_element_by_image(self, image_path: str, region: Optional[Tuple] = None) -> Optional[Tuple]:
         """
         画像による要素検索
         Args:
             image_path: 検索画像パス
-            region: 検索領域
+            region: 検索領域（Noneは全画面）
         Returns:
             見つかった要素の中心座標
         """
         try:
-            # 画像検索
-            location = pyautogui.locateCenterOnScreen(
-                image_path,
-                confidence=self.confidence,
-                region=region
+            pyramid = _load_template(str(image_path))
+            
+            # 検索領域のみキャプチャ
+            if region:
+                left, top, width, height = region
+            else:
+                left, top = 0, 0
+                width, height = self._screen_size
+            buf, shape = self._grab_region_buffer(left, top, width, height)
+            screen = np.ascontiguousarray(
+                np.frombuffer(buf, dtype=np.uint8).reshape(shape)[:, :, :3]
             )
-            if location:
+            
+            # 画像検索
+            match = _match_template_pyramid(screen, pyramid, 1.0 - self.confidence)
+            if match:
+                location = (left + match[0], top + match[1])
                 self.logger.debug(f"画像要素発見: {location}")
                 return location
         except Exception as e:
@@ -87,31 +338,49 @@ class RPAEngine:
             要素が存在すればTrue
         """
         try:
-            # スクリーンショットを取得
-            screenshot = pyautogui.screenshot()
-            # 座標の周辺領域を確認
+            # 座標の周辺領域のみキャプチャ（全画面は撮らない）
             x, y = coords
-            region_size = 10
-            
-            # 領域の平均色を計算
-            region = screenshot.crop((
+            region_size = self.probe_region_size
+            buf, shape = self._grab_region_buffer(
                 x - region_size,
                 y - region_size,
-                x + region_size,
-                y + region_size
-            ))
+                2 * region_size,
+                2 * region_size
+            )
             
-            # numpy配列に変換
-            region_array = np.array(region)
-            mean_color = np.mean(region_array, axis=(0, 1))
+            # 前回と同じ画面なら判定を再利用（バッファ同士の比較はmemcmpで行われる）
+            if buf == self._last_region_bytes:
+                return self._last_region_result
             
-            # 背景色でないことを確認
-            if np.sum(mean_color) > 150:
-                return True
+            # 背景色でないことを確認（全画素のRGB合計を整数のまま閾値比較）
+            region_array = np.frombuffer(buf, dtype=np.uint8).reshape(shape)
+            exists = bool(_region_bright(region_array, self._brightness_thresh))
+            self._last_region_bytes = buf
+            self._last_region_result = exists
+            return exists
         except Exception as e:
             self.logger.debug(f"要素確認エラー: {e}")
         return False
     
+    def _grab_region_buffer(self, left: int, top: int, width: int, height: int) -> Tuple[Union[bytes, bytearray], Tuple[int, int, int]]:
+        """
+        指定領域をキャプチャして生バッファを返す
+        Args:
+            left: 左端X座標
+            top: 上端Y座標
+            width: 幅
+            height: 高さ
+        Returns:
+            (BGR/BGRAバッファ, (高さ, 幅, チャンネル数))
+        """
+        if mss is not None:
+            # mss: BGRAの生バッファ（PILを経由せず、.bgraのbytesコピーも作らない）
+            raw = self._get_sct().grab({'left': left, 'top': top, 'width': width, 'height': height})
+            return raw.raw, (raw.height, raw.width, 4)
+        
+        image = pyautogui.screenshot(region=(left, top, width, height))
+        return image.tobytes('raw', 'BGR'), (image.height, image.width, 3)
+    
     def scroll_to_element(self, coords: Tuple[int, int], max_scrolls: int = 10) -> bool:
         """
         要素までスクロール
@@ -124,21 +393,26 @@ class RPAEngine:
                 self.logger.debug(f"要素発見（スクロール{i}回）")
                 return True
             
-            # 下にスクロール
+            # 下にスクロールし、要素が現れ次第すぐに終了
             pyautogui.scroll(-300)
-            time.sleep(0.5)
+            self._last_region_bytes = None
+            if self._wait_backoff(lambda: self.check_element_exists(coords), timeout=0.5):
+                self.logger.debug(f"要素発見（スクロール{i + 1}回）")
+                return True
         
         self.logger.warning("スクロールしても要素が見つかりません")
         return False
     
-    def take_screenshot(self, filename: Optional[str] = None, region: Optional[Tuple] = None) -> str:
+    def take_screenshot(self, filename: Optional[str] = None, region: Optional[Tuple] = None,
+                        wait: bool = False) -> str:
         """
         スクリーンショット撮影
         Args:
             filename: ファイル名
-            region: 撮影領域
+            region: 撮影領域（Noneは全画面）
+            wait: Trueなら書き込み完了まで待機
         Returns:
-            保存したファイルパス
+            保存先ファイルパス（wait=Falseの場合、戻った時点では書き込み中のことがある）
         """
         if filename is None:
             timestamp = time.strftime('%Y%m%d_%H%M%S')
@@ -147,18 +421,83 @@ class RPAEngine:
         filepath = Path('logs/screenshots') / filename
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
-        if region:
+        if mss is not None:
+            screenshot = self._grab_screenshot_mss(region)
+        elif region:
             screenshot = pyautogui.screenshot(region=region)
         else:
             screenshot = pyautogui.screenshot()
         
-        screenshot.save(filepath)
-        self.logger.debug(f"スクリーンショット保存: {filepath}")
+        # PNGエンコードは保存スレッドで行い、RPA処理を先に進める
+        with self._save_lock:
+            future = self._save_pool.submit(screenshot.save, str(filepath))
+        future.add_done_callback(functools.partial(self._on_screenshot_saved, str(filepath)))
+        if wait:
+            # 保存エラーは_on_screenshot_savedでログ出力済み
+            futures_wait([future])
         return str(filepath)
     
+    def _on_screenshot_saved(self, filepath: str, future: Future):
+        """スクリーンショット保存完了時のログ出力"""
+        error = future.exception()
+        if error:
+            self.logger.error(f"スクリーンショット保存エラー: {filepath}: {error}")
+        else:
+            self.logger.debug(f"スクリーンショット保存: {filepath}")
+    
+    def flush(self):
+        """保存待ちのスクリーンショットを全て書き込み終えるまで待機"""
+        # 入れ替え中に他スレッドが旧プールへ投入しないようロック
+        with self._save_lock:
+            self._save_pool.shutdown(wait=True)
+            self._save_pool = ThreadPoolExecutor(max_workers=1)
+    
+    def _grab_screenshot_mss(self, region: Optional[Tuple]) -> Image.Image:
+        """
+        mssでスクリーンショットを取得
+        Args:
+            region: 撮影領域（Noneはプライマリ画面全体）
+        Returns:
+            PIL画像
+        """
+        sct = self._get_sct()
+        if region:
+            left, top, width, height = region
+            bbox = {'left': left, 'top': top, 'width': width, 'height': height}
+        else:
+            primary = sct.monitors[1]
+            bbox = {key: primary[key] for key in ('left', 'top', 'width', 'height')}
+        
+        raw = sct.grab(bbox)
+        return Image.frombytes('RGB', raw.size, raw.bgra, 'raw', 'BGRX')
+    
+    def _get_sct(self):
+        """呼び出し元スレッドのmssインスタンスを取得（初回のみ作成）"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+    
+    @functools.cached_property
+    def _screen_size(self) -> Tuple[int, int]:
+        """画面サイズ（実行中は変わらないため初回のみ取得）"""
+        return tuple(pyautogui.size())
+    
+    @functools.cached_property
+    def _capture_bounds(self) -> Tuple[int, int, int, int]:
+        """キャプチャ可能な範囲 (left, top, width, height)（mssは全ディスプレイ、それ以外はメイン画面）"""
+        if mss is not None:
+            try:
+                virtual = self._get_sct().monitors[0]
+                return (virtual['left'], virtual['top'], virtual['width'], virtual['height'])
+            except Exception as e:
+                self.logger.debug(f"ディスプレイ範囲取得エラー: {e}")
+        return (0, 0) + self._screen_size
+    
     def get_screen_size(self) -> Tuple[int, int]:
         """画面サイズ取得"""
-        return pyautogui.size()
+        return self._screen_size
     
     def get_mouse_position(self) -> Tuple[int, int]:
         """マウス位置取得"""
@@ -2,10 +2,16 @@
 スプレッドシート管理モジュール
 Googleスプレッドシートとの連携（RPAベース）
 """
+import os
+import sys
+import math
+import atexit
 import pyautogui
 import pyperclip
 import time
 import json
+import weakref
+import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -13,6 +19,37 @@ from datetime import datetime
 from core.rpa_engine import RPAEngine
 from core.human_behavior import HumanBehavior
 from utils.logger import setup_logger
+from utils.coordinates import load_coord_json
+
+# 読み込み完了時のウィンドウタイトルに含まれる文字列
+SHEET_TITLE_KEYWORDS = ('Google Sheets', 'Google スプレッドシート')
+
+# 行Y座標を事前計算する行数
+MAX_ROWS = 10000
+
+# データ行の商品URL列（E列）のインデックス
+URL_COLUMN = 4
+
+# 商品URL → 行番号 の索引の保存先（スプレッドシートURLごとに保持）
+ROW_INDEX_FILE = Path('logs/row_index.json')
+
+# Ctrl+S保存の最小間隔（秒）
+SAVE_INTERVAL = 30
+
+# UI待機時間の倍率の下限（0以下ではUIの反映を待てないため）
+MIN_LATENCY_SCALE = 0.1
+
+# 終了時に未保存の変更を確認するインスタンス（再セットアップで作り直されたものは自動で外れる）
+_live_managers = weakref.WeakSet()
+
+
+def _warn_unsaved_on_exit():
+    """終了時に各インスタンスの行索引を保存し、未保存の変更が残っていれば警告"""
+    for manager in list(_live_managers):
+        manager._warn_unsaved_on_exit()
+
+
+atexit.register(_warn_unsaved_on_exit)
 
 class SpreadsheetManager:
     """
@@ -29,11 +66,13 @@ class SpreadsheetManager:
         self.logger = setup_logger(__name__)
         self.spreadsheet_url = spreadsheet_url
         
+        # UI待機時間の倍率（高速な環境では RPA_LATENCY=0.3 等で短縮）
+        self.latency_scale = self._latency_scale_from_env()
+        
         # 座標読み込み
         coord_file = Path('config/coordinate_sets/spreadsheet.json')
         if coord_file.exists():
-            with open(coord_file, 'r', encoding='utf-8') as f:
-                self.coords = json.load(f)
+            self.coords = load_coord_json(str(coord_file))
         else:
             self.coords = {}
             self.logger.warning("スプレッドシート座標が未設定です")
@@ -42,8 +81,49 @@ class SpreadsheetManager:
         self.rpa = RPAEngine(self.coords)
         self.human = HumanBehavior()
         
-        # 現在の行位置（データ追加用）
-        self.current_row = 2  # ヘッダーは1行目なので2行目から開始
+        # 現在の行位置（データ追加用、ヘッダーは1行目なので2行目から開始）
+        # 商品URL → 行番号 の索引と次に書き込む行（同じシートの前回実行分があれば引き継ぐ）
+        self._row_index: Dict[str, int] = {}
+        self.current_row = 2
+        self._index_url = spreadsheet_url or ''
+        self._load_row_index()
+        
+        # 各行のY座標を事前計算（A2基準、行の高さは既定25px）
+        _, base_y = self.coords.get('cell_a2', (0, 0))
+        self.row_height = self.coords.get('row_height', 25)
+        self._row_ys = base_y + np.arange(MAX_ROWS) * self.row_height
+        
+        # 保存の間引き（未保存の変更があるか、最後に保存した時刻）
+        self._dirty = False
+        self._last_save = 0.0
+        _live_managers.add(self)
+
+    def _latency_scale_from_env(self) -> float:
+        """
+        環境変数 RPA_LATENCY からUI待機時間の倍率を取得
+        Returns:
+            倍率（未設定・不正な値なら1.0、MIN_LATENCY_SCALE 未満は切り上げ）
+        """
+        value = os.environ.get('RPA_LATENCY', '1.0')
+        try:
+            scale = float(value)
+        except ValueError:
+            scale = math.nan
+        if not math.isfinite(scale):
+            self.logger.warning(f"RPA_LATENCY の値が不正なため1.0を使用: {value!r}")
+            return 1.0
+        if scale < MIN_LATENCY_SCALE:
+            self.logger.warning(f"RPA_LATENCY が小さすぎるため{MIN_LATENCY_SCALE}を使用: {value!r}")
+            return MIN_LATENCY_SCALE
+        return scale
+
+    def _sleep(self, seconds: float):
+        """
+        UI待機（latency_scale倍）
+        Args:
+            seconds: 基準の待機時間（秒）
+        """
+        time.sleep(seconds * self.latency_scale)
 
     def open_spreadsheet(self, url: str = None):
         """
@@ -55,24 +135,26 @@ class SpreadsheetManager:
         if not target_url:
             self.logger.error("スプレッドシートURLが設定されていません")
             return False
+        self._switch_row_index(target_url)
         
         self.logger.info("スプレッドシートを開きます")
         
         try:
             # 新しいタブを開く
             pyautogui.hotkey('ctrl', 't')
-            time.sleep(1)
+            self._sleep(1)
             
             # URLバーにフォーカス
             pyautogui.hotkey('ctrl', 'l')
-            time.sleep(0.5)
+            self._sleep(0.5)
             
             # URL入力
             self.human.type_like_human(target_url)
             pyautogui.press('enter')
             
             # ページ読み込み待機
-            time.sleep(5)
+            if not self._wait_for_page_loaded(timeout=10):
+                self.logger.warning("スプレッドシートの読み込み完了を確認できませんでした")
             
             self.logger.info("スプレッドシート開放完了")
             return True
@@ -81,6 +163,74 @@ class SpreadsheetManager:
             self.logger.error(f"スプレッドシート開放エラー: {e}")
             return False
 
+    def _wait_for_page_loaded(self, timeout: float = 10) -> bool:
+        """
+        スプレッドシートの読み込み完了を待機
+        ウィンドウタイトル（Windows）→ 準備完了ピクセル → 固定待機の順に判定
+        Args:
+            timeout: タイムアウト時間（秒）
+        Returns:
+            読み込み完了を確認できたらTrue
+        """
+        # macOS/Linuxのpyautoguiにも getActiveWindowTitle はあるが、呼ぶと例外になるスタブ
+        get_title = getattr(pyautogui, 'getActiveWindowTitle', None)
+        if sys.platform == 'win32' and get_title is not None:
+            def title_ready() -> bool:
+                try:
+                    title = get_title() or ''
+                except Exception as e:
+                    self.logger.debug(f"ウィンドウタイトル取得エラー: {e}")
+                    return False
+                return any(keyword in title for keyword in SHEET_TITLE_KEYWORDS)
+            
+            # タイトルは100ms間隔で確認
+            return self.rpa._wait_backoff(title_ready, timeout, initial_delay=0.1, max_delay=0.1)
+        
+        if 'sheet_ready_pixel' in self.coords:
+            return self.rpa.wait_for_element(self.coords['sheet_ready_pixel'], timeout=timeout)
+        
+        # 判定手段がない場合は従来通り固定待機
+        self._sleep(5)
+        return True
+
+    def _mark_dirty(self, force: bool = False):
+        """
+        未保存の変更を記録し、前回保存からSAVE_INTERVAL秒以上経っていれば保存
+        Args:
+            force: 間隔に関係なく保存するか
+        """
+        self._dirty = True
+        now = time.time()
+        if force or now - self._last_save > SAVE_INTERVAL:
+            pyautogui.hotkey('ctrl', 's')
+            self._sleep(1)
+            self._last_save = now
+            self._dirty = False
+
+    def flush(self):
+        """
+        未保存の変更があれば、スプレッドシートにフォーカスを戻してから保存
+        実行の終わり・保存単位の区切りで呼び出す
+        """
+        if not self._dirty:
+            return
+        if 'cell_a2' not in self.coords:
+            self.logger.warning("シートにフォーカスを戻せないため保存を省略しました（未保存の変更あり）")
+            return
+        try:
+            # 保存キーが他のウィンドウに送られないよう、次に書き込む行のA列をクリックしてから保存
+            self.human.move_and_click((self.coords['cell_a2'][0], self._row_y(self.current_row)))
+            self._sleep(0.5)
+            self._mark_dirty(force=True)
+        except Exception as e:
+            self.logger.error(f"スプレッドシート保存エラー: {e}")
+
+    def _warn_unsaved_on_exit(self):
+        """終了時に行索引を保存し、未保存の変更が残っていれば警告（キー操作は行わない）"""
+        self._save_row_index()
+        if self._dirty:
+            self.logger.warning("スプレッドシートに未保存の変更があります。シートを開いて保存してください")
+
     def setup_headers(self):
         """ヘッダー行を設定"""
         self.logger.info("ヘッダー行を設定します")
@@ -106,23 +256,13 @@ class SpreadsheetManager:
         # A1セルから開始
         if 'header_a1' in self.coords:
             self.human.move_and_click(self.coords['header_a1'])
-            time.sleep(0.5)
+            self._sleep(0.5)
         
-        # ヘッダーを順番に入力
-        for i, header in enumerate(headers):
-            if i > 0:
-                pyautogui.press('tab')  # 次のセルへ
-                time.sleep(0.2)
-            
-            # セルをクリアしてから入力
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.1)
-            self.human.type_like_human(header)
-            time.sleep(0.3)
+        # ヘッダーを1行まとめて貼り付け
+        self._paste_row(headers)
         
-        # 保存
-        pyautogui.hotkey('ctrl', 's')
-        time.sleep(1)
+        # 保存（前回保存から間もなければ後回し）
+        self._mark_dirty()
         
         self.logger.info("ヘッダー行設定完了")
 
@@ -137,38 +277,174 @@ class SpreadsheetManager:
         try:
             # A列の現在行をクリック
             if 'cell_a2' in self.coords:
-                # 基準座標から現在行を計算（行の高さを25pxと仮定）
-                base_x, base_y = self.coords['cell_a2']
-                current_y = base_y + (self.current_row - 2) * 25
+                # 基準座標から現在行を計算
+                base_x = self.coords['cell_a2'][0]
+                current_y = self._row_y(self.current_row)
                 self.human.move_and_click((base_x, current_y))
-                time.sleep(0.5)
+                self._sleep(0.5)
             
-            # データを順番に入力
-            for i, value in enumerate(data):
-                if i > 0:
-                    pyautogui.press('tab')  # 次のセルへ
-                    time.sleep(0.2)
-                
-                # データ入力
-                if value:  # 空でない場合のみ入力
-                    pyautogui.hotkey('ctrl', 'a')
-                    time.sleep(0.1)
-                    self.human.type_like_human(str(value))
-                    time.sleep(0.3)
+            # データを1行まとめて貼り付け
+            self._paste_row(data)
+            
+            # 商品URLの行を索引に登録
+            if len(data) > URL_COLUMN and data[URL_COLUMN]:
+                self._row_index[data[URL_COLUMN]] = self.current_row
             
             # 次の行へ
             self.current_row += 1
             
-            # 定期的に保存
+            # 保存（前回保存から間もなければ後回し）
+            self._mark_dirty()
+            
+            # 定期的に行索引を保存
             if self.current_row % 10 == 0:
-                pyautogui.hotkey('ctrl', 's')
-                time.sleep(1)
+                self._save_row_index()
             
             self.logger.debug(f"データ行追加完了: 行{self.current_row - 1}")
             
         except Exception as e:
             self.logger.error(f"データ行追加エラー: {e}")
 
+    def append_rows(self, rows: List[List[str]]):
+        """
+        複数のデータ行をまとめて追加（1回の貼り付けで連続する行に展開）
+        Args:
+            rows: 追加するデータのリストのリスト
+        """
+        if not rows:
+            return
+        self.logger.debug(f"データ行一括追加: 行{self.current_row}から{len(rows)}行")
+        
+        try:
+            # A列の現在行をクリック
+            if 'cell_a2' in self.coords:
+                base_x = self.coords['cell_a2'][0]
+                current_y = self._row_y(self.current_row)
+                self.human.move_and_click((base_x, current_y))
+                self._sleep(0.5)
+            
+            # 全行を改行区切りで1回に貼り付け
+            self._paste_rows(rows)
+            
+            # 商品URLの行を索引に登録
+            for offset, data in enumerate(rows):
+                if len(data) > URL_COLUMN and data[URL_COLUMN]:
+                    self._row_index[data[URL_COLUMN]] = self.current_row + offset
+            
+            # 次の行へ
+            self.current_row += len(rows)
+            
+            # 保存（前回保存から間もなければ後回し）
+            self._mark_dirty()
+            self._save_row_index()
+            
+            self.logger.debug(f"データ行一括追加完了: 行{self.current_row - 1}まで")
+            
+        except Exception as e:
+            # current_row は失敗時に進めないため、貼り付けに失敗した行範囲を示す
+            self.logger.error(f"データ行一括追加エラー（行{self.current_row}から{len(rows)}行）: {e}")
+
+    def _read_row_indexes(self) -> Dict[str, Dict]:
+        """
+        保存済みの行索引を読み込み
+        Returns:
+            スプレッドシートURL → {'current_row': 次に書き込む行, 'rows': 商品URL → 行番号}
+        """
+        if not ROW_INDEX_FILE.exists():
+            return {}
+        try:
+            with open(ROW_INDEX_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"行索引読み込みエラー: {e}")
+            return {}
+        if 'sheets' not in data:
+            # 旧形式はどのシートの索引か分からないため使わない
+            self.logger.info("シートURLの無い旧形式の行索引を破棄します")
+            return {}
+        return data['sheets']
+
+    def _load_row_index(self):
+        """
+        現在のシートの 商品URL → 行番号 の索引と次に書き込む行を読み込み
+        前回の行から追記し、索引が指す行を上書きしないようにする
+        """
+        entry = self._read_row_indexes().get(self._index_url)
+        if not entry:
+            return
+        self._row_index = entry.get('rows', {})
+        # 索引が指す行より後ろから書き込む
+        saved_row = int(entry.get('current_row', 2))
+        self.current_row = max([saved_row, 2] + [row + 1 for row in self._row_index.values()])
+        self.logger.info(f"行索引を読み込みました: {len(self._row_index)}件（行{self.current_row}から追加）")
+
+    def _switch_row_index(self, url: str):
+        """
+        開くシートが変わった場合、現在の索引を保存してそのシートの索引に切り替え
+        Args:
+            url: 開くスプレッドシートのURL
+        """
+        if url == self._index_url:
+            return
+        self._save_row_index()
+        self._index_url = url
+        self._row_index = {}
+        self.current_row = 2
+        self._load_row_index()
+
+    def _save_row_index(self):
+        """現在のシートの 商品URL → 行番号 の索引と次に書き込む行を保存（他のシートの索引は残す）"""
+        try:
+            sheets = self._read_row_indexes()
+            sheets[self._index_url] = {'current_row': self.current_row, 'rows': self._row_index}
+            ROW_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(ROW_INDEX_FILE, 'w', encoding='utf-8') as f:
+                json.dump({'sheets': sheets}, f, ensure_ascii=False)
+        except Exception as e:
+            self.logger.error(f"行索引保存エラー: {e}")
+
+    def _row_y(self, row: int) -> int:
+        """
+        行番号からY座標を取得
+        Args:
+            row: 行番号（2行目以降）
+        Returns:
+            画面上のY座標
+        """
+        index = row - 2
+        if 0 <= index < len(self._row_ys):
+            return int(self._row_ys[index])
+        return int(self._row_ys[0] + index * self.row_height)
+
+    def _paste_row(self, values: List[str]):
+        """
+        1行分の値をタブ区切りでクリップボードから貼り付け
+        （スプレッドシートがタブ区切りを連続するセルに展開する）
+        Args:
+            values: 左のセルから順に並べた値
+        """
+        self._paste_rows([values])
+
+    def _paste_rows(self, rows: List[List[str]]):
+        """
+        複数行の値をタブ・改行区切りでクリップボードから貼り付け
+        （スプレッドシートが連続する行・セルに展開する）
+        Args:
+            rows: 上の行から順に並べた、左のセルから順の値のリスト
+        """
+        lines = []
+        for values in rows:
+            cells = []
+            for value in values:
+                text = str(value) if value else ''
+                # セル内のタブ・改行は区切りと誤認されるため空白に置換
+                cells.append(text.replace('\t', ' ').replace('\r', ' ').replace('\n', ' '))
+            lines.append('\t'.join(cells))
+        
+        pyperclip.copy('\n'.join(lines))
+        pyautogui.hotkey('ctrl', 'v')
+        self._sleep(0.3)
+
     def update_cell(self, cell_coord: str, value: str):
         """
         特定セルを更新
@@ -179,17 +455,16 @@ class SpreadsheetManager:
         if cell_coord in self.coords:
             try:
                 self.human.move_and_click(self.coords[cell_coord])
-                time.sleep(0.3)
+                self._sleep(0.3)
                 
-                # セルをクリアして新しい値を入力
-                pyautogui.hotkey('ctrl', 'a')
-                time.sleep(0.1)
-                self.human.type_like_human(str(value))
-                time.sleep(0.3)
+                # 選択セルに新しい値を貼り付け（既存の値は置き換わる）
+                # ※Ctrl+Aはシート全体の選択になり、貼り付けが全セルに展開されるため使わない
+                self.human.type_like_human(str(value), typos=False, fast=True)
+                self._sleep(0.3)
                 
                 # Enter で確定
                 pyautogui.press('enter')
-                time.sleep(0.2)
+                self._sleep(0.2)
                 
                 self.logger.debug(f"セル更新: {cell_coord} = {value}")
                 
@@ -204,28 +479,9 @@ class SpreadsheetManager:
         Args:
             url: 検索するURL
         Returns:
-            見つかった行番号
+            見つかった行番号（append_rowで追加した行のみ。未登録ならNone）
         """
-        # 簡易実装：現在は線形検索
-        # 実際の実装ではCtrl+Fで検索機能を使用
-        try:
-            pyautogui.hotkey('ctrl', 'f')
-            time.sleep(0.5)
-            
-            # 検索ボックスにURL入力
-            self.human.type_like_human(url[:50])  # 最初の50文字で検索
-            pyautogui.press('enter')
-            time.sleep(1)
-            
-            # 検索結果があるかチェック（簡易実装）
-            # 実際の行番号取得は困難なため、現在は固定値返却
-            pyautogui.press('escape')  # 検索ボックスを閉じる
-            
-            return self.current_row  # 簡易実装
-            
-        except Exception as e:
-            self.logger.error(f"行検索エラー: {e}")
-            return None
+        return self._row_index.get(url)
 
     def update_product_sourcing(self, product_url: str, update_data: Dict):
         """
@@ -247,9 +503,8 @@ class SpreadsheetManager:
             cell_coord = f'cell_{column.lower()}{row_num}'
             self.update_cell(cell_coord, value)
         
-        # 保存
-        pyautogui.hotkey('ctrl', 's')
-        time.sleep(1)
+        # 保存（前回保存から間もなければ後回し）
+        self._mark_dirty()
 
     def get_statistics(self) -> Dict:
         """
@@ -6,13 +6,21 @@ import sys
 import time
 import logging
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-import json
 
 # モジュールのインポート
 from modules.research import MercariResearcher
 from core.spreadsheet import SpreadsheetManager
 from utils.logger import setup_logger
+from utils.coordinates import load_coord_json
+from utils.json_io import load_json, dump_json
+
+# カテゴリー検索の間隔（レート制限対策、秒）
+CATEGORY_INTERVAL = 60
+
+# 検索結果を絞り込み・保存する単位（件）
+SAVE_BATCH_SIZE = 50
 
 class MercariAutomationSystem:
     """
@@ -48,8 +56,7 @@ class MercariAutomationSystem:
         """設定ファイル読み込み"""
         config_path = Path("config/config.json")
         if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = load_json(config_path)
         else:
             self.logger.warning("設定ファイルが見つかりません。デフォルト設定を使用")
             self.config = {
@@ -69,13 +76,12 @@ class MercariAutomationSystem:
                 self.logger.error(f"{module}の座標が未設定")
                 return False
                 
-            with open(coord_file, 'r', encoding='utf-8') as f:
-                coords = json.load(f)
-                if not coords or len(coords) <= 1:
-                    self.logger.error(f"{module}の座標が不完全")
-                    return False
-                    
-                self.logger.info(f"{module}: {len(coords)-1}項目の座標設定済み")
+            coords = load_coord_json(str(coord_file))
+            if not coords or len(coords) <= 1:
+                self.logger.error(f"{module}の座標が不完全")
+                return False
+                
+            self.logger.info(f"{module}: {len(coords)-1}項目の座標設定済み")
         
         return True
 
@@ -93,39 +99,58 @@ class MercariAutomationSystem:
         # カテゴリー設定（キーワードは使用しない）
         categories = self._load_categories()
         
+        # 次のカテゴリー検索を開始してよい時刻
+        next_search_at = 0.0
+        
         for category_path in categories:
+            # レート制限対策：前回の検索終了からの経過分（保存処理の時間）を差し引いて待機
+            wait = next_search_at - time.time()
+            if wait > 0:
+                self.logger.info(f"レート制限対策: {wait:.0f}秒待機")
+                time.sleep(wait)
+            
             self.logger.info(f"カテゴリー検索: {' > '.join(category_path)}")
             
             try:
                 # メルカリ検索（カテゴリーベース）
-                products = self.researcher.search_by_category(category_path, max_items=50)
-                self.logger.info(f"  検索結果: {len(products)}件")
-                
-                # 業者商品フィルタリング
-                filtered = self.researcher.filter_by_seller_type(products)
-                self.logger.info(f"  業者商品: {len(filtered)}件")
-                
-                # 3日間売上分析
-                analyzed = self.researcher.analyze_3days_sales(filtered)
-                
-                # 基準を満たす商品のみ
-                threshold = self.config.get('monthly_sales_threshold', 30)
-                qualified = [p for p in analyzed if p['monthly_estimate'] >= threshold]
-                self.logger.info(f"  基準クリア: {len(qualified)}件（月{threshold}個以上）")
-                
-                # スプレッドシートに保存
-                if qualified:
-                    self.researcher.save_to_spreadsheet(qualified)
-                
-                all_products.extend(qualified)
-                
-                # レート制限対策
-                time.sleep(60)  # 1分待機
+                # 検索結果は SAVE_BATCH_SIZE 件ずつ絞り込み・保存し、保存後は参照を手放す
+                products = self.researcher.iter_by_category(category_path, max_items=50)
+                while True:
+                    batch = list(islice(products, SAVE_BATCH_SIZE))
+                    if len(batch) < SAVE_BATCH_SIZE:
+                        # 検索が終了した時点から次のカテゴリーまでの間隔を数える
+                        next_search_at = time.time() + CATEGORY_INTERVAL
+                    if not batch:
+                        break
+                    self.logger.info(f"  検索結果: {len(batch)}件")
+                    
+                    # 業者商品フィルタリング
+                    filtered = self.researcher.filter_by_seller_type(batch)
+                    self.logger.info(f"  業者商品: {len(filtered)}件")
+                    
+                    # 3日間売上分析
+                    analyzed = self.researcher.analyze_3days_sales(filtered)
+                    
+                    # 基準を満たす商品のみ
+                    threshold = self.config.get('monthly_sales_threshold', 30)
+                    qualified = [p for p in analyzed if p['monthly_estimate'] >= threshold]
+                    self.logger.info(f"  基準クリア: {len(qualified)}件（月{threshold}個以上）")
+                    
+                    # スプレッドシートに保存
+                    if qualified:
+                        self.researcher.save_to_spreadsheet(qualified)
+                    
+                    all_products.extend(qualified)
+                    if len(batch) < SAVE_BATCH_SIZE:
+                        break
                 
             except Exception as e:
                 self.logger.error(f"カテゴリー{category_path}でエラー: {e}")
                 continue
         
+        # 間引きで後回しになった保存を、シートにフォーカスを戻して実行
+        self.spreadsheet.flush()
+        
         self.logger.info(f"リサーチ完了: 合計{len(all_products)}件")
         return all_products
 
@@ -133,13 +158,9 @@ class MercariAutomationSystem:
         """カテゴリー設定読み込み"""
         categories_file = Path("config/categories.txt")
         if categories_file.exists():
-            categories = []
-            with open(categories_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        categories.append(line.split(' > '))
-            return categories
+            # 一括読み込みしてから行分割
+            lines = [line.strip() for line in categories_file.read_text(encoding='utf-8').splitlines()]
+            return [line.split(' > ') for line in lines if line and not line.startswith('#')]
         else:
             # デフォルトカテゴリー
             return [
@@ -194,8 +215,7 @@ class MercariAutomationSystem:
             # 設定を保存
             config_path = Path("config/config.json")
             config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            dump_json(self.config, config_path)
         
         # スプレッドシートを開く
         if self.spreadsheet.open_spreadsheet():
@@ -229,7 +249,8 @@ class MercariAutomationSystem:
             mapper = CoordinateMapper()
             mapper.start_mapping_session()
             
-            # 座標再読み込み
+            # 座標再読み込み（キャッシュ済みの古い座標を破棄）
+            load_coord_json.cache_clear()
             self.__init__()
             print("座標設定が完了し、システムを再初期化しました")
             
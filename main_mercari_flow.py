@@ -4,11 +4,13 @@ RPAと画像判別を統合した一連の自動処理
 """
 import sys
 import time
-import json
+import queue
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from typing import Dict, List, Optional, Tuple
 import pyautogui
 import numpy as np
 
@@ -17,10 +19,19 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 from modules.research import MercariResearcher
-from core.image_analyzer import ImageAnalyzer
+from core.image_analyzer import (
+    ImageAnalyzer, init_analyzer_worker, analyze_in_worker, analyze_array_in_worker
+)
 from utils.logger import setup_logger
+from utils.coordinates import load_coord_json
+from utils.json_io import dumps_json, dump_json
+from utils.judgment_cache import JudgmentCache
+from utils.rate_limiter import TokenBucket
 from utils.screenshot_helper import get_screenshot_helper
 
+# 異常終了時に回収スレッドの終了を待つ最大時間（秒）
+COLLECTOR_STOP_TIMEOUT = 60
+
 class MercariIntegratedFlow:
     """メルカリ統合フロークラス"""
     
@@ -32,8 +43,21 @@ class MercariIntegratedFlow:
         self.researcher = MercariResearcher()
         self.analyzer = ImageAnalyzer()
         
+        # 画面操作を伴わない重い処理を次の商品の操作と並行させる
+        # OCR（外部プロセス待ち）はスレッド、画像判別（CPU処理）は常駐ワーカープロセスで実行
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.analyzer_pool = ProcessPoolExecutor(max_workers=3, initializer=init_analyzer_worker)
+        
+        # ページ遷移のレート制限（平均30秒に3ページ、一定時間ごとの一括停止はしない）
+        self.page_limiter = TokenBucket(rate=3, per=30)
+        
+        # 同一画像の判別結果キャッシュ（再実行・重複出品で判別を省く）
+        self.judgment_cache = JudgmentCache(version=self.analyzer.cache_version)
+        
         # 結果保存用
         self.results = []
+        self.results_file: Optional[Path] = None
+        self.results_fp = None  # 商品を1件ずつ追記するJSONLファイル
         self.stats = {
             'total_processed': 0,
             'ok_count': 0,
@@ -43,6 +67,11 @@ class MercariIntegratedFlow:
             'end_time': None
         }
         
+        # 判別結果（self.results と同じ順。集計・抽出をnumpyで行う）
+        self._judged = 0
+        self._is_business = np.zeros(64, dtype=bool)
+        self._scores = np.zeros(64, dtype=np.int16)
+        
         # 座標設定読み込み
         self.load_coordinates()
         
@@ -52,11 +81,42 @@ class MercariIntegratedFlow:
         """座標設定を読み込み"""
         coord_file = Path('config/coordinate_sets/mercari.json')
         if coord_file.exists():
-            with open(coord_file, 'r', encoding='utf-8') as f:
-                self.coords = json.load(f)
-                self.logger.info(f"座標設定を読み込みました: {len(self.coords)-1}項目")
+            self.coords = load_coord_json(str(coord_file))
+            self.logger.info(f"座標設定を読み込みました: {len(self.coords)-1}項目")
         else:
             raise FileNotFoundError("座標設定ファイルが見つかりません")
+        
+        # 設定済みのグリッド位置（番号順、最大20商品/ページ）
+        self._grid_slots = [
+            (i, self.coords[f'product_grid_{i}'])
+            for i in range(1, 21)
+            if f'product_grid_{i}' in self.coords
+        ]
+        self._image_main = self.coords.get('product_image_main')
+        self._capture_rect = self._build_capture_rect()
+    
+    def _build_capture_rect(self) -> Tuple[int, int, int, int]:
+        """
+        拡大画像のキャプチャ範囲を座標設定から算出
+        
+        Returns:
+            (left, top, width, height)
+        """
+        if 'expanded_image_area' in self.coords:
+            # 設定済みの範囲を使用
+            area = self.coords['expanded_image_area']
+            rect = (area['top_left'][0], area['top_left'][1], area['width'], area['height'])
+            self.logger.debug(f"設定済み範囲を使用: {rect}")
+        else:
+            # フォールバック：画面中央の600x600ピクセル
+            screen_width, screen_height = pyautogui.size()
+            capture_width = 600
+            capture_height = 600
+            rect = ((screen_width - capture_width) // 2, (screen_height - capture_height) // 2,
+                    capture_width, capture_height)
+            self.logger.warning("拡大画像エリアが未設定のため、デフォルト範囲を使用")
+            self.logger.debug(f"デフォルト範囲: {rect}")
+        return rect
     
     def run_integrated_search(self, 
                             category_path: List[str], 
@@ -81,6 +141,16 @@ class MercariIntegratedFlow:
         
         self.stats['start_time'] = datetime.now()
         
+        # 判別済みの商品は1件ずつJSONLに追記（途中で落ちても処理済み分は残る）
+        if save_results:
+            self.open_results_stream()
+        
+        # 操作済みページの結果回収キュー（回収が遅れても操作が先行しすぎないよう上限を設ける）
+        page_queue = queue.Queue(maxsize=2)
+        collector = threading.Thread(
+            target=self.collect_loop, args=(page_queue, max_items), daemon=True
+        )
+        
         try:
             # メルカリトップページへ移動
             self.researcher.navigate_to_mercari()
@@ -95,41 +165,40 @@ class MercariIntegratedFlow:
             self.researcher.execute_search()
             
             # 商品処理ループ
+            # 操作（メインスレッド）と結果回収（回収スレッド）を分け、
+            # ページNの判別・OCR結果を待つ間にページN+1の操作を進める
             processed_items = 0
             page = 1
+            collector.start()
             
             while processed_items < max_items:
                 self.logger.info(f"\n--- ページ{page}の処理開始 ---")
                 
-                # 現在ページの商品を処理
-                page_results = self.process_page_with_judgment(
-                    max_items - processed_items
-                )
+                # 現在ページの商品を開いて判別・OCRを開始
+                pending = self.browse_page(max_items - processed_items)
                 
-                if not page_results:
+                if not pending:
                     self.logger.info("これ以上商品がありません")
                     break
                 
-                self.results.extend(page_results)
-                processed_items += len(page_results)
-                
-                # 統計更新
-                self.update_statistics(page_results)
-                
-                # 進捗表示
-                self.show_progress(processed_items, max_items)
+                # 結果の回収は回収スレッドに任せる
+                page_queue.put(pending)
+                processed_items += len(pending)
                 
                 # 次ページへ
                 if processed_items < max_items:
+                    # レート制限対策（頻度超過時のみ待機）
+                    waited = self.page_limiter.acquire()
+                    if waited > 0:
+                        self.logger.info(f"レート制限対策: {waited:.0f}秒待機")
+                    
                     if not self.researcher.go_to_next_page():
                         self.logger.info("次ページが見つかりません")
                         break
                     page += 1
-                    
-                    # レート制限対策
-                    if page % 3 == 0:
-                        self.logger.info("レート制限対策: 30秒待機")
-                        time.sleep(30)
+            
+            # 残りのページの結果回収を待つ
+            self.stop_collector(page_queue, collector)
             
             # 処理完了
             self.stats['end_time'] = datetime.now()
@@ -145,10 +214,73 @@ class MercariIntegratedFlow:
             return self.results
             
         except Exception as e:
-            self.logger.error(f"統合検索エラー: {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
+            # スタックトレースは出力時にだけ整形される
+            self.logger.exception("統合検索エラー: %s", e)
+            # 回収済みの結果を返せるよう回収スレッドの終了を待つ（応答がなければ打ち切る）
+            self.stop_collector(page_queue, collector, timeout=COLLECTOR_STOP_TIMEOUT)
             return self.results
+        
+        finally:
+            # 途中で例外・中断があっても結果ファイルとワーカーを片付ける
+            self.stop_collector(page_queue, collector, timeout=COLLECTOR_STOP_TIMEOUT)
+            self.close()
+    
+    def stop_collector(self, page_queue: queue.Queue, collector: threading.Thread,
+                       timeout: Optional[float] = None):
+        """
+        回収スレッドに終了を通知し、残りのページの回収を待つ
+        
+        Args:
+            page_queue: 回収スレッドのキュー
+            collector: 回収スレッド
+            timeout: 通知・待機それぞれの最大時間（秒）。Noneなら回収が終わるまで待つ
+        """
+        if not collector.is_alive():
+            return
+        try:
+            # キューが満杯でも回収スレッドが取り出せば空く。応答がなければ通知を諦める
+            page_queue.put(None, timeout=timeout)
+        except queue.Full:
+            self.logger.warning("回収スレッドが応答しないため終了通知を中止")
+            return
+        collector.join(timeout)
+        if collector.is_alive():
+            self.logger.warning("回収スレッドの終了待ちを打ち切りました")
+    
+    def close(self):
+        """結果ファイルを閉じ、判別・OCR・保存のワーカーを終了"""
+        if self.results_fp is not None:
+            try:
+                self.results_fp.close()
+            except Exception as e:
+                self.logger.error(f"結果ファイルクローズエラー: {e}")
+            self.results_fp = None
+        self.pool.shutdown(wait=True)
+        self.analyzer_pool.shutdown(wait=True)
+        self.researcher.close()
+    
+    def collect_loop(self, page_queue: queue.Queue, max_items: int):
+        """
+        回収スレッド本体：キューに積まれたページの結果を順に回収（Noneで終了）
+        
+        Args:
+            page_queue: browse_page の戻り値を受け取るキュー
+            max_items: 処理する商品数（進捗表示用）
+        """
+        while True:
+            pending = page_queue.get()
+            if pending is None:
+                break
+            try:
+                self.results.extend(self.collect_page(pending))
+                
+                # 統計更新
+                self.update_statistics()
+                
+                # 進捗表示
+                self.show_progress(len(self.results), max_items)
+            except Exception as e:
+                self.logger.error(f"結果回収エラー: {e}")
     
     def process_page_with_judgment(self, max_items: int) -> List[Dict]:
         """
@@ -160,57 +292,60 @@ class MercariIntegratedFlow:
         Returns:
             画像判別結果を含む商品リスト
         """
-        products = []
+        return self.collect_page(self.browse_page(max_items))
+    
+    def browse_page(self, max_items: int) -> List[tuple]:
+        """
+        ページ内の商品を順に開いて情報を取得し、画像判別・OCRをバックグラウンドで開始
+        
+        Args:
+            max_items: このページで処理する最大商品数
+            
+        Returns:
+            (グリッド番号, 商品情報, 画像判別のFuture, 売上カウントのFuture) のリスト
+        """
+        pending = []
         items_processed = 0
         
         # グリッド位置の商品を順番に処理
-        for i in range(1, 21):  # 最大20商品/ページ
+        for i, coords in self._grid_slots:
             if items_processed >= max_items:
                 break
             
-            grid_key = f'product_grid_{i}'
-            if grid_key not in self.coords:
-                continue
-            
             try:
-                self.logger.info(f"\n=== 商品{i}処理開始 ===")
+                self.logger.info("\n=== 商品%s処理開始 ===", i)
                 
                 # 商品をCommand+クリックで新タブで開く
-                coords = self.coords[grid_key]
-                self.researcher.human.command_click(coords)
-                time.sleep(2)  # ページ読み込み待機
+                self.researcher.open_product(coords)  # ページ読み込み待機を含む
                 
-                # 商品情報抽出
-                product = self.researcher.extract_product_details()
+                # 商品情報と売却履歴を1回で取得（画像はPNG保存せずメモリ上で判別に回す）
+                # 個人出品者と確定済みの販売者は画像取得・判別を省く
+                product, history = self.researcher.extract_all(
+                    save_image=False, skip_image_for=self.judgment_cache.is_personal_seller
+                )
                 
                 if product:
-                    # 画像判別を実行
-                    product = self.process_product_image(product)
-                    
-                    # 3日間売上カウント
-                    sales_3days = self.researcher.count_3days_sales()
-                    product['sales_3days'] = sales_3days if sales_3days is not None else 0
-                    product['monthly_estimate'] = product['sales_3days'] * 10
+                    # 画像判別を開始（結果はページ処理の最後に回収）
+                    if product.get('known_personal_seller'):
+                        judgment = Future()
+                        judgment.set_result({
+                            'is_business': False,
+                            'score': 0,
+                            'reasons': ['判別済みの個人出品者'],
+                            'details': {}
+                        })
+                    else:
+                        judgment = self.process_product_image(product)
                     
-                    # 結果を追加
-                    products.append(product)
-                    
-                    # ログ出力
-                    self.logger.info(
-                        f"商品{i}: {product.get('title', 'タイトル不明')[:30]}..."
-                    )
-                    self.logger.info(
-                        f"  判別結果: {'OK (業者)' if product.get('is_business') else 'NG (個人)'}"
-                    )
-                    self.logger.info(
-                        f"  スコア: {product.get('judgment_score', 0)}点"
-                    )
-                    self.logger.info(
-                        f"  3日売上: {product['sales_3days']}個"
-                    )
+                    # 3日間売上・販売者評価のOCRはまとめてバックグラウンドで実行
+                    seller = product.get('seller', {})
+                    rating_image = seller.pop('rating_image', None)
+                    ocr = self.pool.submit(self.researcher.ocr_extracted, history, rating_image,
+                                           seller.get('name'))
+                    pending.append((i, product, judgment, ocr))
                 
                 # タブを閉じて一覧に戻る
-                self.researcher.human.close_current_tab()
+                self.researcher.close_product_tab()
                 items_processed += 1
                 
                 # 人間らしい休憩
@@ -222,7 +357,7 @@ class MercariIntegratedFlow:
                     self.perform_scroll_with_adjustment()
                 
             except Exception as e:
-                self.logger.error(f"商品{i}の処理エラー: {e}")
+                self.logger.exception("商品%sの処理エラー: %s", i, e)
                 self.stats['error_count'] += 1
                 # エラー時もタブを閉じる
                 try:
@@ -231,109 +366,196 @@ class MercariIntegratedFlow:
                     pass
                 continue
         
+        return pending
+    
+    def collect_page(self, pending: List[tuple]) -> List[Dict]:
+        """
+        browse_page で開始した判別・OCRの結果を回収して商品情報に反映
+        
+        Args:
+            pending: browse_page の戻り値
+            
+        Returns:
+            画像判別結果を含む商品リスト
+        """
+        products = []
+        for i, product, judgment, ocr in pending:
+            product = self.apply_judgment(product, judgment)
+            try:
+                sales_3days, rating = ocr.result()
+                if rating is not None:
+                    product['seller']['rating'] = rating
+            except Exception as e:
+                self.logger.error(f"商品{i}のOCRエラー: {e}")
+                sales_3days = None
+            product['sales_3days'] = sales_3days if sales_3days is not None else 0
+            product['monthly_estimate'] = product['sales_3days'] * 10
+            
+            # 結果を追加
+            products.append(product)
+            self.record_judgment(product)
+            self.write_result(product)
+            
+            # ログ出力
+            # （出力されないレベルでは文字列を組み立てないよう遅延フォーマット）
+            self.logger.info("商品%s: %s...", i, product.get('title', 'タイトル不明')[:30])
+            self.logger.info("  判別結果: %s", 'OK (業者)' if product.get('is_business') else 'NG (個人)')
+            self.logger.info("  スコア: %s点", product.get('judgment_score', 0))
+            self.logger.info("  3日売上: %s個", product['sales_3days'])
+        
         return products
     
-    def process_product_image(self, product: Dict) -> Dict:
+    def process_product_image(self, product: Dict) -> Optional[Future]:
         """
-        商品画像を判別処理
+        商品画像の判別をバックグラウンドで開始
         
         Args:
             product: 商品情報
             
         Returns:
-            判別結果を追加した商品情報
+            判別結果のFuture（画像取得失敗時はNone）
         """
         try:
-            # 拡大画像を取得
-            if not product.get('image_path'):
-                # 画像をキャプチャ（拡大表示）
-                image_path = self.capture_expanded_product_image()
-                product['image_path'] = image_path
+            # 拡大画像は extract_all が売却履歴へのスクロール前に取得済み
+            # （取得できなかった商品をここで撮り直すとスクロール後の別の箇所を写すため、未判別とする）
+            image = product.pop('image', None)
             
-            # 画像判別実行
-            if product.get('image_path') and Path(product['image_path']).exists():
-                result = self.analyzer.analyze_single_image(product['image_path'])
+            # 画像判別は画面操作を伴わないため、次の商品の処理と並行して実行
+            if image is not None:
+                # PNGを経由せず配列のまま渡す（保存はOK判定の商品のみ apply_judgment で行う）
+                product['_capture'] = (image, datetime.now().strftime('%Y%m%d_%H%M%S_%f'))
+                array = np.ascontiguousarray(np.asarray(image.convert('RGB'))[:, :, ::-1])
                 
-                # 結果を商品情報に追加
-                product['is_business'] = result.get('is_business', False)
-                product['judgment_score'] = result.get('score', 0)
-                product['judgment_reasons'] = result.get('reasons', [])
-                product['judgment_details'] = result.get('details', {})
+                # 判別済みの画像ならキャッシュの結果を使う
+                key = self.judgment_cache.key_for(array)
+                cached = self.judgment_cache.get(key)
+                if cached is not None:
+                    self.logger.debug("画像判別: キャッシュ済みの結果を使用")
+                    judgment = Future()
+                    judgment.set_result(cached)
+                    return judgment
                 
-                self.logger.debug(f"画像判別完了: スコア{product['judgment_score']}点")
-            else:
-                # 画像取得失敗時
-                product['is_business'] = False
-                product['judgment_score'] = 0
-                product['judgment_reasons'] = ['画像取得失敗']
-                self.logger.warning("画像取得失敗のためNG判定")
+                product['_judgment_key'] = key
+                return self.analyzer_pool.submit(analyze_array_in_worker, array)
+            if product.get('image_path') and Path(product['image_path']).exists():
+                return self.analyzer_pool.submit(analyze_in_worker, product['image_path'])
+                
+        except Exception as e:
+            self.logger.error(f"画像取得エラー: {e}")
+        
+        return None
+    
+    def apply_judgment(self, product: Dict, judgment: Optional[Future]) -> Dict:
+        """
+        画像判別結果を商品情報に反映
+        
+        Args:
+            product: 商品情報
+            judgment: process_product_image が返したFuture
+            
+        Returns:
+            判別結果を追加した商品情報
+        """
+        capture = product.pop('_capture', None)
+        cache_key = product.pop('_judgment_key', None)
+        
+        if judgment is None:
+            # 画像取得失敗時（未判別。OKには含めない）
+            product['is_business'] = False
+            product['judged'] = False
+            product['judgment_score'] = 0
+            product['judgment_reasons'] = ['画像取得失敗（未判別）']
+            self.logger.warning("画像取得失敗のため未判別")
+            return product
+        
+        try:
+            result = judgment.result()
+            if cache_key is not None and not result.get('error'):
+                self.judgment_cache.put(cache_key, result)
+            
+            # 販売者ごとの判別結果を記録（NGが続いた販売者は次回から画像取得を省く）
+            if not result.get('error') and not product.get('known_personal_seller'):
+                self.judgment_cache.record_seller(
+                    product.get('seller', {}).get('name'), bool(result.get('is_business'))
+                )
+            
+            # 結果を商品情報に追加
+            product['is_business'] = result.get('is_business', False)
+            product['judged'] = not result.get('error')
+            product['judgment_score'] = result.get('score', 0)
+            product['judgment_reasons'] = result.get('reasons', [])
+            product['judgment_details'] = result.get('details', {})
+            
+            # メモリ上で判別した画像はOK判定のときだけ保存
+            if capture is not None:
+                product['image_path'] = self.save_capture(*capture) if product['is_business'] else ''
+            
+            self.logger.debug("画像判別完了: スコア%s点", product['judgment_score'])
                 
         except Exception as e:
             self.logger.error(f"画像判別エラー: {e}")
             product['is_business'] = False
+            product['judged'] = False
             product['judgment_score'] = 0
             product['judgment_reasons'] = [f'判別エラー: {str(e)}']
         
         return product
     
-    def capture_expanded_product_image(self) -> str:
+    def save_capture(self, image, timestamp: str) -> str:
         """
-        商品画像をクリックして拡大表示し、指定範囲をキャプチャ
-        マルチディスプレイ・Retina対応版
+        キャプチャ画像をバックグラウンドでPNG保存（圧縮率より速度を優先）
         
+        Args:
+            image: キャプチャ画像（PIL.Image）
+            timestamp: キャプチャ時刻（ファイル名用）
+            
         Returns:
-            保存した画像のパス
+            保存先のパス
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filepath = Path(f'data/images/mercari/{timestamp}_product.png')
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            self.pool.submit(image.save, filepath, compress_level=1)
+            self.logger.info("画像保存: %s", filepath)
+            return str(filepath)
+        except Exception as e:
+            self.logger.error(f"画像保存エラー: {e}")
+            return ""
+    
+    def capture_expanded_product_image(self):
+        """
+        商品画像をクリックして拡大表示し、指定範囲をキャプチャ
+        マルチディスプレイ・Retina対応版
         
+        Returns:
+            キャプチャ画像（PIL.Image）。失敗時はNone
+        """
         # スクリーンショットヘルパーを取得
         screenshot_helper = get_screenshot_helper()
         
         try:
             # メイン画像をクリックして拡大表示
-            if 'product_image_main' in self.coords:
-                self.logger.debug("商品画像をクリックして拡大表示")
-                coords = self.coords['product_image_main']
-                pyautogui.click(coords[0], coords[1])
-                time.sleep(2)  # モーダル表示待機
+            if self._image_main:
+                rect = self._capture_rect
+                before = self.researcher.rpa.snapshot_region(rect)
                 
-                # 座標設定から拡大画像エリアを取得
-                if 'expanded_image_area' in self.coords:
-                    # 設定済みの範囲を使用
-                    area = self.coords['expanded_image_area']
-                    left = area['top_left'][0]
-                    top = area['top_left'][1]
-                    capture_width = area['width']
-                    capture_height = area['height']
-                    
-                    self.logger.debug(f"設定済み範囲を使用: ({left}, {top}, {capture_width}, {capture_height})")
-                else:
-                    # フォールバック：画面中央の600x600ピクセル
-                    screen_width, screen_height = pyautogui.size()
-                    capture_width = 600
-                    capture_height = 600
-                    left = (screen_width - capture_width) // 2
-                    top = (screen_height - capture_height) // 2
-                    
-                    self.logger.warning("拡大画像エリアが未設定のため、デフォルト範囲を使用")
-                    self.logger.debug(f"デフォルト範囲: ({left}, {top}, {capture_width}, {capture_height})")
+                self.logger.debug("商品画像をクリックして拡大表示")
+                pyautogui.click(self._image_main[0], self._image_main[1])
+                self.researcher.wait_for_screen_change(rect, before, timeout=2)  # モーダル表示待機
                 
                 # マルチディスプレイ対応スクリーンショット撮影
-                screenshot = screenshot_helper.capture_region(left, top, capture_width, capture_height)
-                screenshot.save(filepath)
+                screenshot = screenshot_helper.capture_region(*rect)
                 
                 # モーダルを閉じる（ESCキー）
+                modal = self.researcher.rpa.snapshot_region(rect)
                 pyautogui.press('escape')
-                time.sleep(1)
+                self.researcher.wait_for_screen_change(rect, modal, timeout=1)
                 
-                self.logger.info(f"画像保存: {filepath}")
-                return str(filepath)
+                return screenshot
                 
             else:
                 self.logger.error("product_image_main座標が設定されていません")
-                return ""
+                return None
                 
         except Exception as e:
             self.logger.error(f"画像キャプチャエラー: {e}")
@@ -342,38 +564,48 @@ class MercariIntegratedFlow:
                 pyautogui.press('escape')
             except:
                 pass
-            return ""
+            return None
     
     def perform_scroll_with_adjustment(self):
-        """改善されたスクロール処理"""
+        """改善されたスクロール処理（1回でスクロールし、グリッドの描画が落ち着いたら戻る）"""
         try:
             # スクロール基準位置に移動
             if 'scroll_position' in self.coords:
                 scroll_pos = self.coords['scroll_position']
                 pyautogui.moveTo(scroll_pos[0], scroll_pos[1])
-                time.sleep(0.3)
             
-            # 段階的スクロール（より自然に）
-            scroll_amounts = [-300, -300, -200]  # 徐々に減速
-            for amount in scroll_amounts:
-                pyautogui.scroll(amount)
-                time.sleep(0.5)
+            # 11番目の商品位置の表示変化でスクロール完了を判定
+            grid = self.coords.get('product_grid_11')
+            region = (grid[0] - 50, grid[1] - 50, 100, 100) if grid else None
+            before = self.researcher.rpa.snapshot_region(region) if region else None
+            
+            # 段階的スクロール（-300, -300, -200）の合計を1回で送る
+            pyautogui.scroll(-800)
             
             # スクロール後の安定化待機
-            time.sleep(2)
+            self.researcher.wait_for_screen_change(region, before, timeout=2)
             
             self.logger.debug("スクロール完了")
             
         except Exception as e:
             self.logger.error(f"スクロールエラー: {e}")
     
-    def update_statistics(self, page_results: List[Dict]):
+    def record_judgment(self, product: Dict):
+        """判別結果を集計用配列に記録"""
+        if self._judged >= len(self._is_business):
+            # 容量不足時は倍に拡張
+            size = len(self._is_business) * 2
+            self._is_business = np.resize(self._is_business, size)
+            self._scores = np.resize(self._scores, size)
+        self._is_business[self._judged] = bool(product.get('is_business'))
+        self._scores[self._judged] = product.get('judgment_score', 0)
+        self._judged += 1
+    
+    def update_statistics(self):
         """統計情報を更新"""
-        for product in page_results:
-            if product.get('is_business'):
-                self.stats['ok_count'] += 1
-            else:
-                self.stats['ng_count'] += 1
+        ok_count = int(self._is_business[:self._judged].sum())
+        self.stats['ok_count'] = ok_count
+        self.stats['ng_count'] = self._judged - ok_count
     
     def show_progress(self, current: int, total: int):
         """進捗表示"""
@@ -381,8 +613,29 @@ class MercariIntegratedFlow:
         self.logger.info(f"\n進捗: {current}/{total} ({percentage:.1f}%)")
         self.logger.info(f"OK: {self.stats['ok_count']}件, NG: {self.stats['ng_count']}件")
     
+    def open_results_stream(self):
+        """商品結果を追記するJSONLファイルを開く"""
+        try:
+            timestamp = self.stats['start_time'].strftime('%Y%m%d_%H%M%S')
+            self.results_file = Path(f'data/results/mercari_results_{timestamp}.jsonl')
+            self.results_file.parent.mkdir(parents=True, exist_ok=True)
+            # 行バッファリング（1件ごとにディスクへ書き出す）
+            self.results_fp = open(self.results_file, 'a', encoding='utf-8', buffering=1)
+        except Exception as e:
+            self.logger.error(f"結果ファイルオープンエラー: {e}")
+            self.results_fp = None
+    
+    def write_result(self, product: Dict):
+        """商品結果をJSONLに1行追記"""
+        if self.results_fp is None:
+            return
+        try:
+            self.results_fp.write(dumps_json(product) + '\n')
+        except Exception as e:
+            self.logger.error(f"結果追記エラー: {e}")
+    
     def save_results(self):
-        """結果をJSONファイルに保存"""
+        """統計情報をJSONファイルに保存（商品はJSONLに追記済み）"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             result_file = Path(f'data/results/mercari_results_{timestamp}.json')
@@ -392,16 +645,20 @@ class MercariIntegratedFlow:
             save_data = {
                 'timestamp': timestamp,
                 'statistics': self.stats,
-                'products': self.results
+                'products_file': str(self.results_file) if self.results_file else None
             }
             
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
+            # start_time/end_time（datetime）はISO形式の文字列として書き出される
+            dump_json(save_data, result_file)
             
             self.logger.info(f"結果を保存しました: {result_file}")
             
         except Exception as e:
             self.logger.error(f"結果保存エラー: {e}")
+        finally:
+            if self.results_fp is not None:
+                self.results_fp.close()
+                self.results_fp = None
     
     def show_final_report(self):
         """最終レポート表示"""
@@ -423,10 +680,10 @@ class MercariIntegratedFlow:
             self.logger.info(f"業者率: {ok_rate:.1f}%")
         
         # OK商品のリスト表示
-        ok_products = [p for p in self.results if p.get('is_business')]
-        if ok_products:
+        ok_indices = np.flatnonzero(self._is_business[:self._judged])[:10]
+        if len(ok_indices):
             self.logger.info("\n--- OK判定商品 ---")
-            for i, product in enumerate(ok_products[:10], 1):
+            for i, product in enumerate((self.results[j] for j in ok_indices), 1):
                 self.logger.info(
                     f"{i}. {product.get('title', '不明')[:40]}... "
                     f"(スコア: {product.get('judgment_score', 0)}点, "
@@ -11,19 +11,76 @@
 """
 import pyautogui
 import pyperclip
+import numpy as np
 import time
 import json
 import re
+import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Callable, Iterator, List, Dict, Mapping, Optional, Tuple
 import random
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 from core.rpa_engine import RPAEngine
 from core.human_behavior import HumanBehavior
-from utils.ocr_reader import OCRReader
+from utils.ocr_reader import OCRReader, RESIDENT_ENGINE, init_ocr_worker, ocr_in_worker
+from utils.browser_tabs import BrowserTabs
+from utils.judgment_cache import JudgmentCache
 from utils.logger import setup_logger
+from utils.coordinates import load_coord_json
 from utils.screenshot_helper import get_screenshot_helper
+from utils.rate_limiter import TokenBucket, backoff_delays
+
+# カテゴリー名 → 座標キー
+CATEGORY_COORD_KEYS: Mapping[str, str] = MappingProxyType({
+    '家電・スマホ・カメラ': 'category_electronics',
+    'PC/タブレット': 'category_pc_tablet',
+    'PC周辺機器': 'category_pc_accessories',
+    'おもちゃ・ホビー・グッズ': 'category_toys',
+    'スポーツ・レジャー': 'category_sports',
+    'おもちゃ': 'category_toys_general',
+    'キャラクターグッズ': 'category_character',
+    'トレーニング/エクササイズ': 'category_training',
+    'トレーニング用品': 'category_training_goods'
+})
+
+# リサーチで使う座標キー（未設定の処理は省略されるため、起動時にまとめて警告する）
+EXPECTED_COORDS = (
+    'logo', 'search_bar', 'category_button', 'all_categories_button',
+    'sold_filter', 'sold_out_checkbox', 'condition_filter', 'condition_new',
+    'sort_order', 'sort_newest', 'search_button', 'scroll_position', 'next_page',
+    'product_title', 'product_price', 'seller_name', 'seller_rating',
+    'product_image_main', 'expanded_image_area', 'sold_history_area',
+)
+
+# 検索フィルターのクリック順（座標キー, 最大待機秒数）。メニューを開く操作は長めに待つ
+SEARCH_FILTER_STEPS = (
+    ('sold_filter', 0.8),        # 販売状況
+    ('sold_out_checkbox', 0.5),  # 売り切れ
+    ('condition_filter', 0.8),   # 商品の状態
+    ('condition_new', 0.5),      # 新品・未使用
+    ('sort_order', 0.8),         # 並び順
+    ('sort_newest', 0.5),        # 新しい順
+)
+
+# 価格表記の数字部分（桁区切りのカンマを含む。例: ¥1,980 → 1,980）
+PRICE_RE = re.compile(r'\d[\d,]*')
+
+# OCR結果キャッシュの最大件数（同じ販売者の評価・同じ売却履歴の再OCRを省く）
+OCR_CACHE_SIZE = 2048
+
+# 販売者評価を再利用する期限（秒）。同じ販売者の評価は期限内ならOCRし直さない
+SELLER_RATING_TTL = 3600
+
+# 売却履歴の1行に今日の売上表記（時間前・分前など）を含む行
+TODAY_SALE_RE = re.compile(r'^([^\n]*?(?:時間前|分前|たった今|1時間以内)[^\n]*)', re.MULTILINE)
+# 売却履歴の1行に3日以内の売上表記（1〜3日前）を含む行
+WITHIN_3DAYS_SALE_RE = re.compile(r'^([^\n]*?([1-3]日前)[^\n]*)', re.MULTILINE)
 
 class MercariResearcher:
     """
@@ -48,17 +105,102 @@ class MercariResearcher:
                 "python tools/coordinate_mapper.py を実行してください。"
             )
         
-        with open(coord_file, 'r', encoding='utf-8') as f:
-            self.coords = json.load(f)
+        self.coords = load_coord_json(str(coord_file))
+        
+        # 設定済みのグリッド位置（番号順、最大20商品/ページ）
+        self._grid_slots = [
+            (i, self.coords[f'product_grid_{i}'])
+            for i in range(1, 21)
+            if f'product_grid_{i}' in self.coords
+        ]
+        
+        # キャプチャ範囲 (left, top, width, height)。未設定ならNone
+        self._sold_history_rect = self._area_rect('sold_history_area', default=(100, 400, 800, 600))
+        self._expanded_image_rect = self._area_rect('expanded_image_area')
+        
+        # 未設定の座標は実行途中ではなく起動時にまとめて知らせる
+        missing = [key for key in EXPECTED_COORDS if key not in self.coords]
+        if not self._grid_slots:
+            missing.append('product_grid_1〜20')
+        if missing:
+            self.logger.warning("座標未設定（該当する処理は省略されます）: %s", ', '.join(missing))
+        
+        # 座標が設定済みのカテゴリーのみ（カテゴリー名 → 座標キー）
+        self._category_coord_keys = {
+            name: key for name, key in CATEGORY_COORD_KEYS.items() if key in self.coords
+        }
         
         # モジュール初期化
         self.rpa = RPAEngine(self.coords)
         self.ocr = OCRReader()
         self.human = HumanBehavior()
+        self.tabs = BrowserTabs()
+        
+        # OS別コマンドキー（実行中に変わらないため1度だけ取得）
+        self._cmd_key = self.human.get_cmd_key()
+        
+        # スクロール設定（初回スクロールか → (スクロール量, 回数)）
+        scroll_settings = self.coords.get('scroll_settings', {})
+        self._scroll_plan = {
+            # 初回スクロール（1-10から11-20へ）
+            True: (scroll_settings.get('first_scroll', -400),
+                   scroll_settings.get('scroll_count_first', 2)),
+            # 通常スクロール（2回目以降）
+            False: (scroll_settings.get('regular_scroll', -600),
+                    scroll_settings.get('scroll_count_regular', 3)),
+        }
         
         # 設定
         self.max_retries = 3
         self.retry_delay = 5
+        
+        # ページ遷移のレート制限（平均30秒に3ページ）
+        self.page_limiter = TokenBucket(rate=3, per=30)
+        
+        # OCR（画面操作を伴わない）を次の商品の操作と並行させる
+        self.ocr_pool = ThreadPoolExecutor(max_workers=4)
+        
+        # 言語モデルを常駐できる場合、OCRは専用ワーカープロセスで行いGILの競合を避ける
+        self.ocr_workers = (
+            ProcessPoolExecutor(max_workers=2, initializer=init_ocr_worker)
+            if RESIDENT_ENGINE else None
+        )
+        
+        # OCR結果キャッシュ（画像ハッシュと言語 → テキスト。古いものから破棄）
+        self._ocr_cache: OrderedDict[str, str] = OrderedDict()
+        self._ocr_cache_lock = threading.Lock()
+        
+        # 販売者評価（販売者名 → (評価テキスト, 取得時刻)）
+        self._seller_ratings: Dict[str, Tuple[str, float]] = {}
+        
+        # 拡大画像のPNG保存（保存先パス → 保存処理のFuture。完了したものは削除）
+        self.io_pool = ThreadPoolExecutor(max_workers=2)
+        self._pending_saves: Dict[str, Future] = {}
+
+    def close(self):
+        """OCR・画像保存のワーカーを終了（実行中の処理と保存待ちの画像は書き終えてから終了）"""
+        self.ocr_pool.shutdown(wait=True)
+        self.io_pool.shutdown(wait=True)
+        if self.ocr_workers is not None:
+            self.ocr_workers.shutdown(wait=True)
+            self.ocr_workers = None
+
+    def _area_rect(self, key: str,
+                   default: Optional[Tuple[int, int, int, int]] = None) -> Optional[Tuple[int, int, int, int]]:
+        """
+        エリア座標（top_left・width・height）をキャプチャ範囲に変換
+        Args:
+            key: 座標キー
+            default: 単一座標で設定されている場合の範囲
+        Returns:
+            (left, top, width, height)。未設定ならNone
+        """
+        area = self.coords.get(key)
+        if area is None:
+            return None
+        if isinstance(area, dict) and 'top_left' in area:
+            return (area['top_left'][0], area['top_left'][1], area['width'], area['height'])
+        return default
 
     def search_by_category(self, category_path: List[str], max_items: int = 100) -> List[Dict]:
         """
@@ -69,8 +211,20 @@ class MercariResearcher:
         Returns:
             商品情報のリスト
         """
+        return list(self.iter_by_category(category_path, max_items))
+
+    def iter_by_category(self, category_path: List[str], max_items: int = 100) -> Iterator[Dict]:
+        """
+        カテゴリー検索（キーワード不使用）の結果をページ単位で順次返す
+        全件をリストに溜めないため、呼び出し側で一定件数ごとに保存・破棄できる
+        Args:
+            category_path: カテゴリー階層のリスト
+            max_items: 最大取得商品数
+        Returns:
+            商品情報のイテレータ
+        """
         self.logger.info(f"カテゴリー検索開始: {' > '.join(category_path)}")
-        products = []
+        collected = 0
         
         try:
             # メルカリトップページへ
@@ -86,35 +240,40 @@ class MercariResearcher:
             self.execute_search()
             
             # 商品収集
+            # ページNのOCR結果は、ページN+1への移動（読み込み待ち）を済ませてから回収する
             page = 1
-            while len(products) < max_items:
+            while collected < max_items:
                 self.logger.info(f"ページ{page}の商品を収集中...")
                 
-                # 現在ページの商品を処理
-                page_products = self.process_search_results_page(max_items - len(products))
-                if not page_products:
+                # 現在ページの商品を開いてOCRを開始
+                pending = self.browse_results_page(max_items - collected)
+                if not pending:
                     self.logger.info("これ以上商品がありません")
                     break
                 
-                products.extend(page_products)
+                collected += len(pending)
                 
                 # 次ページへ
-                if len(products) < max_items:
-                    if not self.go_to_next_page():
-                        break
-                    page += 1
+                has_next = False
+                if collected < max_items:
+                    # レート制限対策（頻度超過時のみ待機）
+                    waited = self.page_limiter.acquire()
+                    if waited > 0:
+                        self.logger.info(f"レート制限対策: {waited:.0f}秒待機")
+                    
+                    has_next = self.go_to_next_page()
+                
+                yield from self.collect_results(pending)
                 
-                # レート制限対策
-                if page % 3 == 0:
-                    self.logger.info("レート制限対策: 30秒待機")
-                    time.sleep(30)
+                if not has_next:
+                    break
+                page += 1
                     
         except Exception as e:
             self.logger.error(f"カテゴリー検索エラー: {e}")
             raise
         
-        self.logger.info(f"カテゴリー検索完了: {len(products)}件")
-        return products
+        self.logger.info(f"カテゴリー検索完了: {collected}件")
 
     def navigate_to_mercari(self):
         """メルカリトップページへ移動（ロゴクリック方式）"""
@@ -123,21 +282,18 @@ class MercariResearcher:
         # ロゴクリックでトップページに移動
         if 'logo' in self.coords:
             self.logger.debug("ロゴをクリックしてトップページに移動")
-            self.human.move_and_click(self.coords['logo'])
-            time.sleep(2)  # ページ読み込み待機
+            self.click_and_wait('logo', timeout=2)  # ページ読み込み待機
             
             # 検索ボタンをクリック（検索ページ表示のため）
             if 'search_bar' in self.coords:
                 self.logger.debug("検索ボタンをクリックして検索ページを表示")
-                self.human.move_and_click(self.coords['search_bar'])
-                time.sleep(1.5)
+                self.click_and_wait('search_bar', timeout=1.5)
                 self.logger.info("✓ 検索ページ表示完了")
             else:
                 self.logger.error("検索ボタンの座標が設定されていません")
                 raise ValueError("検索ボタンの座標が設定されていません")
             
-            # ロゴが表示されているか確認（トップページ移動完了の確認）
-            self.rpa.wait_for_element(self.coords['logo'], timeout=10)
+            # 検索ページの表示は click_and_wait で確認済み（ロゴの再確認は行わない）
             self.logger.info("✓ メルカリトップページ移動完了")
         else:
             self.logger.error("ロゴの座標が設定されていません")
@@ -153,82 +309,67 @@ class MercariResearcher:
         
         # カテゴリーボタンクリック
         if 'category_button' in self.coords:
-            self.human.move_and_click(self.coords['category_button'])
-            time.sleep(1.5)
+            self.click_and_wait('category_button', timeout=1.5)
         
         # 必須：「すべて」ボタンを最初にクリック
         if 'all_categories_button' in self.coords:
             self.logger.debug("  必須操作: 「すべて」ボタンをクリック")
-            self.human.move_and_click(self.coords['all_categories_button'])
-            time.sleep(1)
+            self.click_and_wait('all_categories_button', timeout=1)
         
         # カテゴリー階層を順番に選択
-        category_coords_map = {
-            '家電・スマホ・カメラ': 'category_electronics',
-            'PC/タブレット': 'category_pc_tablet',
-            'PC周辺機器': 'category_pc_accessories',
-            'おもちゃ・ホビー・グッズ': 'category_toys',
-            'スポーツ・レジャー': 'category_sports',
-            'おもちゃ': 'category_toys_general',
-            'キャラクターグッズ': 'category_character',
-            'トレーニング/エクササイズ': 'category_training',
-            'トレーニング用品': 'category_training_goods'
-        }
-        
         for i, category in enumerate(category_path):
-            coord_key = category_coords_map.get(category)
-            if coord_key and coord_key in self.coords:
+            coord_key = self._category_coord_keys.get(category)
+            if coord_key:
                 self.logger.debug(f"  階層{i+1}: {category}")
-                self.human.move_and_click(self.coords[coord_key])
-                time.sleep(1)
+                self.click_and_wait(coord_key, timeout=1)
             else:
                 self.logger.warning(f"カテゴリー座標未定義: {category}")
 
     def apply_search_filters(self):
-        """検索フィルター適用"""
+        """検索フィルター適用（未設定の座標は待機せず飛ばす）"""
         self.logger.debug("フィルター適用")
         
-        # 販売状況（売り切れ）
-        if 'sold_filter' in self.coords:
-            self.human.move_and_click(self.coords['sold_filter'])
-            time.sleep(0.8)
-        
-        if 'sold_out_checkbox' in self.coords:
-            self.human.move_and_click(self.coords['sold_out_checkbox'])
-            time.sleep(0.5)
-        
-        # 商品の状態フィルター
-        if 'condition_filter' in self.coords:
-            self.human.move_and_click(self.coords['condition_filter'])
-            time.sleep(0.8)
-        
-        # 新品・未使用を選択
-        if 'condition_new' in self.coords:
-            self.human.move_and_click(self.coords['condition_new'])
-            time.sleep(0.5)
-        
-        # 並び順変更
-        if 'sort_order' in self.coords:
-            self.human.move_and_click(self.coords['sort_order'])
-            time.sleep(0.8)
-        
-        if 'sort_newest' in self.coords:
-            self.human.move_and_click(self.coords['sort_newest'])
-            time.sleep(0.5)
+        for key, timeout in SEARCH_FILTER_STEPS:
+            if key in self.coords:
+                self.click_and_wait(key, timeout=timeout)
 
     def execute_search(self):
         """検索実行"""
         self.logger.debug("検索実行")
         
+        # 検索結果読み込み待機（先頭商品の位置の表示が切り替わるまで）
         if 'search_button' in self.coords:
-            self.human.move_and_click(self.coords['search_button'])
+            watch_key = 'product_grid_1' if 'product_grid_1' in self.coords else None
+            self.click_and_wait('search_button', timeout=3, watch_key=watch_key)
+        elif 'product_grid_1' not in self.coords:
+            # 結果の表示を確認する手段がない場合のみ固定待機
+            time.sleep(3)
         
-        # 検索結果読み込み待機
-        time.sleep(3)
-        
-        # 最初の商品が表示されるまで待機
+        # 最初の商品が表示されるまで待機（表示されなければ間隔を空けて再読み込み）
         if 'product_grid_1' in self.coords:
-            self.rpa.wait_for_element(self.coords['product_grid_1'], timeout=10)
+            self.wait_for_results()
+
+    def wait_for_results(self) -> bool:
+        """
+        検索結果の先頭商品が表示されるまで待機
+        表示されない場合はアクセス制限・読み込み失敗とみなし、指数バックオフで待ってから再読み込み
+        Returns:
+            表示されたらTrue
+        """
+        grid = self.coords['product_grid_1']
+        if self.rpa.wait_for_element(grid, timeout=10):
+            return True
+        
+        cmd_key = self._cmd_key
+        for delay in backoff_delays(base=5, factor=2, max_tries=3):
+            self.logger.warning("検索結果が表示されないため%.0f秒待って再読み込み", delay)
+            time.sleep(delay)
+            pyautogui.hotkey(cmd_key, 'r')  # OS別対応
+            if self.rpa.wait_for_element(grid, timeout=10):
+                return True
+        
+        self.logger.error("再読み込み後も検索結果が表示されません")
+        return False
 
     def process_search_results_page(self, max_items: int) -> List[Dict]:
         """
@@ -238,59 +379,53 @@ class MercariResearcher:
         Returns:
             商品情報のリスト
         """
-        products = []
+        return self.collect_results(self.browse_results_page(max_items))
+
+    def browse_results_page(self, max_items: int) -> List[tuple]:
+        """
+        検索結果ページの商品を順に開いて情報を取得し、OCRを開始（結果は待たない）
+        Args:
+            max_items: このページで処理する最大商品数
+        Returns:
+            (グリッド番号, 商品情報, OCRのFuture) のリスト
+        """
+        # (グリッド番号, 商品情報, OCRのFuture)
+        pending = []
         items_processed = 0
         
-        # グリッド位置の商品を順番に処理
-        for i in range(1, 21):  # 最大20商品/ページ
+        # 設定済みのグリッド位置の商品を順番に処理（最大20商品/ページ）
+        for i, coords in self._grid_slots:
             if items_processed >= max_items:
                 break
             
-            grid_key = f'product_grid_{i}'
-            if grid_key not in self.coords:
-                continue
-                
             try:
                 self.logger.info(f"=== 商品{i}処理開始 ===")
-                grid_key = f'product_grid_{i}'
-                
-                if grid_key not in self.coords:
-                    self.logger.warning(f"座標未設定: {grid_key}")
-                    continue
-                
-                coords = self.coords[grid_key]
                 self.logger.info(f"商品{i}座標: {coords}")
                 
                 # 商品をCommand+クリックで新タブで開く
                 self.logger.info(f"商品{i}: command_click呼び出し開始")
-                self.human.command_click(coords)
+                self.open_product(coords)
                 self.logger.info(f"商品{i}: command_click呼び出し完了")
                 
-                # 商品情報抽出
+                # 商品情報と売却履歴のキャプチャを取得
                 self.logger.info(f"商品{i}: 詳細情報抽出開始")
-                product = self.extract_product_details()
+                product, history = self.extract_all()
                 
                 if product:
                     self.logger.info(f"商品{i}: 商品情報取得成功")
-                    # 3日間売上カウント（必須）- None対策
+                    # 3日間売上カウント（必須）・販売者評価のOCRは、次の商品の操作と並行して実行
                     self.logger.info(f"商品{i}: 売上カウント開始")
-                    sales_3days = self.count_3days_sales()
-                    self.logger.info(f"商品{i}: 売上カウント結果: {sales_3days}")
-                    
-                    product['sales_3days'] = sales_3days if sales_3days is not None else 0
-                    product['monthly_estimate'] = product['sales_3days'] * 10
-                    products.append(product)
-                    
-                    self.logger.info(
-                        f"商品{i}: {product.get('title', 'タイトル不明')[:30]}... "
-                        f"(3日売上: {product['sales_3days']})"
-                    )
+                    seller = product.get('seller', {})
+                    rating_image = seller.pop('rating_image', None)
+                    ocr = self.ocr_pool.submit(self.ocr_extracted, history, rating_image,
+                                               seller.get('name'))
+                    pending.append((i, product, ocr))
                 else:
                     self.logger.warning(f"商品{i}: 商品情報取得失敗")
                 
                 # タブを閉じて一覧に戻る
                 self.logger.info(f"商品{i}: タブクローズ開始")
-                self.human.close_current_tab()
+                self.close_product_tab()
                 self.logger.info(f"商品{i}: タブクローズ完了")
                 
                 items_processed += 1
@@ -306,10 +441,8 @@ class MercariResearcher:
                 self.logger.info(f"=== 商品{i}処理完了 ===")
                     
             except Exception as e:
-                self.logger.error(f"商品{i}の処理エラー: {e}")
-                self.logger.error(f"エラー詳細: {type(e).__name__}: {str(e)}")
-                import traceback
-                self.logger.error(f"スタックトレース: {traceback.format_exc()}")
+                # スタックトレースは出力時にだけ整形される
+                self.logger.exception("商品%sの処理エラー: %s: %s", i, type(e).__name__, e)
                 # エラー時もタブを閉じる
                 try:
                     self.human.close_current_tab()
@@ -317,6 +450,37 @@ class MercariResearcher:
                     pass
                 continue
         
+        return pending
+
+    def collect_results(self, pending: List[tuple]) -> List[Dict]:
+        """
+        browse_results_page で開始したOCRの結果を待って商品情報に反映
+        Args:
+            pending: browse_results_page の戻り値
+        Returns:
+            商品情報のリスト
+        """
+        products = []
+        for i, product, ocr in pending:
+            try:
+                sales_3days, rating = ocr.result()
+                if rating is not None:
+                    product['seller']['rating'] = rating
+            except Exception as e:
+                self.logger.error(f"商品{i}のOCRエラー: {e}")
+                sales_3days = None
+            self.logger.info(f"商品{i}: 売上カウント結果: {sales_3days}")
+            
+            # None対策
+            product['sales_3days'] = sales_3days if sales_3days is not None else 0
+            product['monthly_estimate'] = product['sales_3days'] * 10
+            products.append(product)
+            
+            self.logger.info(
+                f"商品{i}: {product.get('title', 'タイトル不明')[:30]}... "
+                f"(3日売上: {product['sales_3days']})"
+            )
+        
         return products
 
     def perform_scroll(self, is_first_scroll: bool = False):
@@ -325,40 +489,38 @@ class MercariResearcher:
         Args:
             is_first_scroll: 初回スクロールかどうか
         """
-        # スクロール設定を取得
-        scroll_settings = self.coords.get('scroll_settings', {})
-        
-        if is_first_scroll:
-            # 初回スクロール（1-10から11-20へ）
-            scroll_amount = scroll_settings.get('first_scroll', -400)
-            scroll_count = scroll_settings.get('scroll_count_first', 2)
-            self.logger.debug(f"初回スクロール: {scroll_amount}px × {scroll_count}回")
-        else:
-            # 通常スクロール（2回目以降）
-            scroll_amount = scroll_settings.get('regular_scroll', -600)
-            scroll_count = scroll_settings.get('scroll_count_regular', 3)
-            self.logger.debug(f"通常スクロール: {scroll_amount}px × {scroll_count}回")
+        # スクロール設定を取得（初期化時に解決済み）
+        scroll_amount, scroll_count = self._scroll_plan[is_first_scroll]
+        self.logger.debug("%sスクロール: %spx × %s回", '初回' if is_first_scroll else '通常',
+                          scroll_amount, scroll_count)
         
         # スクロール基準位置に移動
+        region = None
+        before = None
         if 'scroll_position' in self.coords:
-            pyautogui.moveTo(
-                self.coords['scroll_position'][0], 
-                self.coords['scroll_position'][1]
-            )
-            time.sleep(0.3)
+            x, y = self.coords['scroll_position']
+            pyautogui.moveTo(x, y)
+            region = self._watch_region(x, y)
+            before = self.rpa.snapshot_region(region) if region else None
         
         # スクロール実行
         for i in range(scroll_count):
             pyautogui.scroll(scroll_amount)
-            time.sleep(0.5)
             self.logger.debug(f"スクロール {i+1}/{scroll_count}")
         
         # スクロール後の安定化待機
-        time.sleep(2)
+        self.wait_for_screen_change(region, before, timeout=2)
 
-    def extract_product_details(self) -> Optional[Dict]:
+    def extract_product_details(self, save_image: bool = True, defer_ocr: bool = False,
+                                skip_image_for: Optional[Callable[[str], bool]] = None) -> Optional[Dict]:
         """
         商品詳細情報を抽出
+        Args:
+            save_image: Trueなら拡大画像をPNG保存して'image_path'に、
+                        Falseなら保存せず'image'（PIL.Image）に格納
+            defer_ocr: Trueなら販売者評価のOCRを行わず、画像を seller['rating_image'] に格納
+            skip_image_for: 販売者名を受け取りTrueを返したら画像を取得せず
+                            'known_personal_seller'=True を設定（販売者情報を先に取得する）
         Returns:
             商品情報の辞書
         """
@@ -370,19 +532,22 @@ class MercariResearcher:
             }
             
             # OS別コマンドキー取得
-            cmd_key = self.human.get_cmd_key()
+            cmd_key = self._cmd_key
+            
+            # リモートデバッグが有効ならタブ情報からURL・タイトルを読む（クリップボード操作を省く）
+            tab = self.tabs.find_page('/item/')
             
             # タイトル取得
-            if 'product_title' in self.coords:
+            if tab and tab['title']:
+                product['title'] = tab['title']
+                self.logger.info("タイトル取得: %s...", product['title'][:50])
+            elif 'product_title' in self.coords:
                 pyautogui.tripleClick(
                     self.coords['product_title'][0], 
                     self.coords['product_title'][1]
                 )
-                time.sleep(0.3)
-                pyautogui.hotkey(cmd_key, 'c')  # OS別対応
-                time.sleep(0.3)
-                product['title'] = pyperclip.paste().strip()
-                self.logger.info(f"タイトル取得: {product['title'][:50]}...")
+                product['title'] = self.copy_selection(cmd_key).strip()
+                self.logger.info("タイトル取得: %s...", product['title'][:50])
             
             # 価格取得
             if 'product_price' in self.coords:
@@ -390,33 +555,43 @@ class MercariResearcher:
                     self.coords['product_price'][0],
                     self.coords['product_price'][1]
                 )
-                time.sleep(0.3)
-                pyautogui.hotkey(cmd_key, 'c')  # OS別対応
-                time.sleep(0.3)
-                price_text = pyperclip.paste()
+                price_text = self.copy_selection(cmd_key)
                 
                 # 価格を数値に変換
-                price_match = re.search(r'[\d,]+', price_text.replace(',', ''))
+                price_match = PRICE_RE.search(price_text)
                 if price_match:
-                    product['price'] = int(price_match.group())
+                    product['price'] = int(price_match.group().replace(',', ''))
                 else:
                     product['price'] = 0
                 
-                self.logger.info(f"価格取得: {product['price']}円")
+                self.logger.info("価格取得: %s円", product['price'])
             
             # URL取得
-            pyautogui.hotkey(cmd_key, 'l')  # OS別対応
-            time.sleep(0.3)
-            pyautogui.hotkey(cmd_key, 'c')  # OS別対応
-            time.sleep(0.3)
-            product['url'] = pyperclip.paste()
+            if tab:
+                product['url'] = tab['url']
+            else:
+                pyautogui.hotkey(cmd_key, 'l')  # OS別対応
+                product['url'] = self.copy_selection(cmd_key)
+            
+            # 販売者情報（画像キャプチャの要否判定に使う場合は先に取得）
+            if skip_image_for is not None and 'seller_name' in self.coords:
+                product['seller'] = self.extract_seller_info(defer_ocr=defer_ocr)
+                seller_name = product['seller'].get('name')
+                if seller_name and skip_image_for(seller_name):
+                    # 判別済みの個人出品者は拡大画像のキャプチャを省く
+                    self.logger.info("判別済みの個人出品者のため画像取得を省略: %s", seller_name)
+                    product['known_personal_seller'] = True
+                    return product
             
             # 商品画像キャプチャ
-            product['image_path'] = self.capture_product_image()
+            if save_image:
+                product['image_path'] = self.capture_product_image()
+            else:
+                product['image'] = self.grab_product_image()
             
             # 販売者情報
-            if 'seller_name' in self.coords:
-                product['seller'] = self.extract_seller_info()
+            if 'seller_name' in self.coords and 'seller' not in product:
+                product['seller'] = self.extract_seller_info(defer_ocr=defer_ocr)
             
             return product
             
@@ -424,77 +599,197 @@ class MercariResearcher:
             self.logger.error(f"商品詳細抽出エラー: {e}")
             return None
 
+    def copy_selection(self, cmd_key: str, timeout: float = 1.0) -> str:
+        """
+        選択中のテキストをコピーして取得（固定待機せず、クリップボードが更新された時点で戻る）
+        Args:
+            cmd_key: get_cmd_key() の戻り値
+            timeout: 最大待機時間（秒）
+        Returns:
+            コピーされたテキスト（タイムアウト時は空文字）
+        """
+        # 前の値と区別できるよう空にしてからコピー
+        pyperclip.copy('')
+        pyautogui.hotkey(cmd_key, 'c')  # OS別対応
+        
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            text = pyperclip.paste()
+            if text or time.monotonic() >= deadline:
+                return text
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def extract_all(self, save_image: bool = True,
+                    skip_image_for: Optional[Callable[[str], bool]] = None) -> Tuple[Optional[Dict], Optional[object]]:
+        """
+        商品詳細と売却履歴のキャプチャを1回の呼び出しで取得（画面操作のみ、OCRは保留）
+        保留したOCRは ocr_extracted でまとめて実行する
+        Args:
+            save_image: extract_product_details の save_image
+            skip_image_for: extract_product_details の skip_image_for
+        Returns:
+            (商品情報, 売却履歴画像)。商品情報の取得失敗時は (None, None)
+        """
+        product = self.extract_product_details(save_image=save_image, defer_ocr=True,
+                                               skip_image_for=skip_image_for)
+        if product is None:
+            return None, None
+        return product, self.capture_sales_history()
+
+    def ocr_extracted(self, history, rating_image=None,
+                      seller_name: Optional[str] = None) -> Tuple[Optional[int], Optional[str]]:
+        """
+        extract_all で保留したOCR（3日間売上・販売者評価）をまとめて実行
+        画面操作を伴わないため、別スレッドから呼び出してもよい
+        Args:
+            history: 売却履歴画像（Noneなら売上カウントしない）
+            rating_image: 販売者評価の画像（seller['rating_image']）
+            seller_name: 販売者名（指定時は評価を記憶し、次回以降のOCRを省く）
+        Returns:
+            (3日間の売上個数, 販売者評価テキスト)。対象がなければそれぞれNone
+        """
+        sales = self.count_sales_in_image(history) if history is not None else None
+        rating = None
+        if rating_image is not None:
+            rating = self._ocr_image(rating_image, 'jpn+eng')
+            self._remember_rating(seller_name, rating)
+        return sales, rating
+
+    def _cached_rating(self, name: Optional[str]) -> Optional[str]:
+        """
+        記憶済みの販売者評価を取得
+        Args:
+            name: 販売者名
+        Returns:
+            評価テキスト（未記憶・SELLER_RATING_TTL 経過時はNone）
+        """
+        entry = self._seller_ratings.get(name) if name else None
+        if entry is None or time.monotonic() - entry[1] > SELLER_RATING_TTL:
+            return None
+        return entry[0]
+
+    def _remember_rating(self, name: Optional[str], rating: Optional[str]):
+        """
+        販売者評価を記憶（販売者名・評価が空なら何もしない）
+        Args:
+            name: 販売者名
+            rating: 評価テキスト
+        """
+        if name and rating:
+            self._seller_ratings[name] = (rating, time.monotonic())
+
+    def _ocr_image(self, image, lang: str) -> str:
+        """
+        画像をOCR（一時ファイルを経由せずメモリ上の画像を渡す）
+        同じ画像は OCR_CACHE_SIZE 件までキャッシュした結果を返す
+        Args:
+            image: PIL.Image
+            lang: 認識言語
+        Returns:
+            抽出されたテキスト
+        """
+        key = f"{lang}:{JudgmentCache.key_for(np.asarray(image))}"
+        with self._ocr_cache_lock:
+            text = self._ocr_cache.get(key)
+            if text is not None:
+                self._ocr_cache.move_to_end(key)
+                return text
+        
+        text = self._recognize(image, lang)
+        with self._ocr_cache_lock:
+            self._ocr_cache[key] = text
+            if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+        return text
+
+    def _recognize(self, image, lang: str) -> str:
+        """
+        画像をOCR（キャッシュを使わない）
+        Args:
+            image: PIL.Image
+            lang: 認識言語
+        Returns:
+            抽出されたテキスト
+        """
+        if self.ocr_workers is not None:
+            try:
+                # BGR配列にしてOCR専用プロセスへ渡す（呼び出し元スレッドは結果を待つだけ）
+                array = np.ascontiguousarray(np.asarray(image.convert('RGB'))[:, :, ::-1])
+                return self.ocr_workers.submit(ocr_in_worker, array, lang).result()
+            except Exception as e:
+                self.logger.warning(f"OCRワーカーが使えないため同一プロセスで実行: {e}")
+                self.ocr_workers = None
+        return self.ocr.extract_text_from_image(image, lang=lang)
+
     def count_3days_sales(self) -> int:
         """
         3日間の売上個数カウント（必須機能）
         Returns:
             3日間の売上個数
         """
+        screenshot = self.capture_sales_history()
+        if screenshot is None:
+            return None
+        return self.count_sales_in_image(screenshot)
+
+    def capture_sales_history(self):
+        """
+        ページ下部の売却履歴エリアをキャプチャ（画面操作のみ、OCRは行わない）
+        Returns:
+            売却履歴エリアの画像（PIL.Image）。エリア未設定・失敗時はNone
+        """
         self.logger.debug("3日間売上カウント開始")
         
         # スクリーンショットヘルパーを取得
         screenshot_helper = get_screenshot_helper()
         
         try:
-            # ページ下部へスクロール
-            for _ in range(3):
-                pyautogui.scroll(-500)
-                time.sleep(0.5)
-            
-            # 売却履歴エリアをキャプチャ
-            if 'sold_history_area' in self.coords:
-                area = self.coords['sold_history_area']
-                # エリア座標の場合
-                if isinstance(area, dict) and 'top_left' in area:
-                    left = area['top_left'][0]
-                    top = area['top_left'][1]
-                    width = area['width']
-                    height = area['height']
-                    
-                    # マルチディスプレイ対応スクリーンショット
-                    screenshot = screenshot_helper.capture_region(left, top, width, height)
-                else:
-                    # 単一座標の場合はデフォルトサイズ
-                    screenshot = screenshot_helper.capture_region(100, 400, 800, 600)
-                
-                temp_path = 'temp_sales.png'
-                screenshot.save(temp_path)
-                
-                # OCRでテキスト抽出
-                text = self.ocr.extract_text(temp_path, lang='jpn')
-                
-                # 売上カウント
-                count = 0
-                # 今日の売上パターン
-                today_patterns = ['時間前', '分前', 'たった今', '1時間以内']
-                # 3日以内の売上パターン
-                within_3days_patterns = ['1日前', '2日前', '3日前']
-                
-                lines = text.split('\n')
-                for line in lines:
-                    # 今日の売上
-                    for pattern in today_patterns:
-                        if pattern in line:
-                            count += 1
-                            self.logger.debug(f"売却検出（今日）: {line[:50]}")
-                            break
-                    
-                    # 3日以内の売上
-                    for pattern in within_3days_patterns:
-                        if pattern in line:
-                            count += 1
-                            self.logger.debug(f"売却検出（{pattern}）: {line[:50]}")
-                            break
-                
-                # 一時ファイル削除
-                try:
-                    Path(temp_path).unlink()
-                except:
-                    pass
-                
-                self.logger.info(f"3日間売上: {count}個")
-                return count
+            # 売却履歴エリア（単一座標の場合はデフォルトサイズ）
+            region = self._sold_history_rect
+            before = self.rpa.snapshot_region(region) if region else None
+            
+            # ページ下部へスクロール（-500 × 3回分を1回で送る）し、売却履歴エリアの表示が落ち着くまで待機
+            pyautogui.scroll(-1500)
+            self.wait_for_screen_change(region, before, timeout=1.5)
+            
+            # 売却履歴エリアをキャプチャ（マルチディスプレイ対応スクリーンショット）
+            if region is not None:
+                return screenshot_helper.capture_region(*region)
                 
+        except Exception as e:
+            self.logger.error(f"売却履歴キャプチャエラー: {e}")
+        return None
+
+    def count_sales_in_image(self, screenshot) -> int:
+        """
+        売却履歴画像をOCRして3日間の売上個数をカウント
+        画面操作を伴わないため、別スレッドから呼び出してもよい
+        Args:
+            screenshot: capture_sales_history で取得した画像
+        Returns:
+            3日間の売上個数
+        """
+        try:
+            # OCRでテキスト抽出
+            text = self._ocr_image(screenshot, 'jpn')
+            
+            # 売上カウント（今日・3日以内の表記を含む行をそれぞれ1行1件で数える）
+            if self.logger.isEnabledFor(logging.DEBUG):
+                today = [m.group(1) for m in TODAY_SALE_RE.finditer(text)]
+                within = [(m.group(2), m.group(1)) for m in WITHIN_3DAYS_SALE_RE.finditer(text)]
+                for line in today:
+                    self.logger.debug("売却検出（今日）: %s", line[:50])
+                for pattern, line in within:
+                    self.logger.debug("売却検出（%s）: %s", pattern, line[:50])
+                count = len(today) + len(within)
+            else:
+                count = len(TODAY_SALE_RE.findall(text)) + len(WITHIN_3DAYS_SALE_RE.findall(text))
+            
+            self.logger.info("3日間売上: %s個", count)
+            return count
+            
         except Exception as e:
             self.logger.error(f"3日間売上カウントエラー: {e}")
             return 0
@@ -510,6 +805,8 @@ class MercariResearcher:
         try:
             # 簡易実装：画像ファイルが存在すれば一旦OKとする
             # 実際の画像判別ロジックは後で実装
+            if image_path:
+                self.wait_for_saved(image_path)
             if image_path and Path(image_path).exists():
                 self.logger.debug("画像判別: 仮実装でOK判定")
                 return True
@@ -520,9 +817,84 @@ class MercariResearcher:
             self.logger.error(f"画像判別エラー: {e}")
             return False
 
+    def open_product(self, coords: Tuple[int, int], timeout: float = 3.0):
+        """
+        商品を新タブで開き、商品ページが表示されるまで待機
+        タブの作成は中クリック直後に完了するため固定待機は短くし、ページの読み込みは表示の変化で待つ
+        Args:
+            coords: 商品のグリッド座標
+            timeout: ページ表示の最大待機時間（秒）
+        """
+        self.human.command_click(coords, wait=0.5)
+        self.wait_for_product_page(timeout=timeout)
+
+    def wait_for_product_page(self, timeout: float = 2.0):
+        """
+        商品ページの表示待機（タイトル周辺の描画が落ち着いた時点で戻る）
+        Args:
+            timeout: 最大待機時間（秒）。タイトル座標が未設定なら固定待機
+        """
+        if 'product_title' not in self.coords:
+            time.sleep(timeout)
+            return
+        x, y = self.coords['product_title']
+        self.rpa.wait_for_region_settled((x - 100, y - 15, 200, 30), require_content=True, timeout=timeout)
+
+    def close_product_tab(self, timeout: float = 1.0):
+        """
+        商品ページのタブを閉じ、一覧ページに切り替わるまで待機
+        Args:
+            timeout: 最大待機時間（秒）。タイトル座標が未設定なら固定待機
+        """
+        if 'product_title' not in self.coords:
+            self.human.close_current_tab(wait=timeout)
+            return
+        x, y = self.coords['product_title']
+        region = (x - 100, y - 15, 200, 30)
+        before = self.rpa.snapshot_region(region)
+        self.human.close_current_tab(wait=0)
+        self.wait_for_screen_change(region, before, timeout)
+
+    def click_and_wait(self, key: str, timeout: float, watch_key: Optional[str] = None):
+        """
+        座標をクリックし、画面が変化して落ち着くまで待機（固定sleepの代わり）
+        Args:
+            key: クリックする座標キー
+            timeout: 最大待機時間（秒）。変化を検出できない場合はこの時間待つ
+            watch_key: 変化を監視する座標キー（省略時はクリック位置）
+        """
+        region = self._watch_region(*self.coords[watch_key or key])
+        before = self.rpa.snapshot_region(region) if region else None
+        self.human.move_and_click(self.coords[key])
+        self.wait_for_screen_change(region, before, timeout)
+
+    def _watch_region(self, x: int, y: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        座標の直下の監視領域（ボタン自体のホバー表示を含めず、開いたメニューや再描画を捉える）
+        Args:
+            x, y: 基準座標
+        Returns:
+            (left, top, width, height)。画面端の座標では画面内に切り詰める（画面外ならNone）
+        """
+        return self.rpa.clamp_region((x - 150, y + 20, 300, 200))
+
+    def wait_for_screen_change(self, region: Optional[Tuple[int, int, int, int]],
+                               before: Optional[bytes], timeout: float):
+        """
+        領域の表示が before から変化して落ち着くまで待機（モーダルの開閉待ち）
+        Args:
+            region: (left, top, width, height)。Noneなら固定待機
+            before: 操作前の rpa.snapshot_region の結果。Noneなら固定待機
+            timeout: 最大待機時間（秒）
+        """
+        if region is None or before is None:
+            time.sleep(timeout)
+            return
+        self.rpa.wait_for_region_settled(region, changed_from=before, timeout=timeout)
+
     def capture_product_image(self) -> str:
         """
-        商品画像をクリックして拡大表示し、指定範囲をキャプチャ
+        商品画像をクリックして拡大表示し、指定範囲をキャプチャして保存
         マルチディスプレイ・Retina対応版（v1.2）
         Returns:
             保存した拡大画像のパス
@@ -531,26 +903,70 @@ class MercariResearcher:
         filepath = Path(f'data/images/mercari/{timestamp}_expanded.png')
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
+        screenshot = self.grab_product_image()
+        if screenshot is None:
+            return ""
+        
+        try:
+            # 画像保存（PNGエンコード・書き込みはバックグラウンドで行い、パスを先に返す）
+            path = str(filepath)
+            future = self.io_pool.submit(screenshot.save, filepath, compress_level=1)
+            self._pending_saves[path] = future
+            future.add_done_callback(functools.partial(self._on_image_saved, path))
+            return path
+        except Exception as e:
+            self.logger.error(f"拡大画像保存エラー: {e}")
+            return ""
+
+    def _on_image_saved(self, path: str, future: Future):
+        """
+        拡大画像のバックグラウンド保存完了時の処理
+        Args:
+            path: 保存先のパス
+            future: 保存処理のFuture
+        """
+        self._pending_saves.pop(path, None)
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"拡大画像保存エラー: {error}")
+        else:
+            self.logger.info("拡大画像保存: %s", path)
+
+    def wait_for_saved(self, path: str):
+        """
+        拡大画像のバックグラウンド保存が終わるまで待機（保存済み・対象外なら即座に戻る）
+        Args:
+            path: capture_product_image が返したパス
+        """
+        future = self._pending_saves.get(path)
+        if future is not None:
+            future.exception()
+
+    def grab_product_image(self):
+        """
+        商品画像をクリックして拡大表示し、指定範囲をキャプチャ（保存はしない）
+        Returns:
+            拡大画像（PIL.Image）。失敗時はNone
+        """
         # スクリーンショットヘルパーを取得
         screenshot_helper = get_screenshot_helper()
         
         try:
             # メイン画像をクリックして拡大表示
             if 'product_image_main' in self.coords:
+                # 座標設定から拡大画像エリアを取得
+                rect = self._expanded_image_rect
+                before = self.rpa.snapshot_region(rect) if rect is not None else None
+                
                 self.logger.info("商品画像をクリックして拡大表示")
                 self.human.move_and_click(self.coords['product_image_main'])
-                time.sleep(2)  # モーダル表示待機
+                self.wait_for_screen_change(rect, before, timeout=2)  # モーダル表示待機
                 
-                # 座標設定から拡大画像エリアを取得
-                if 'expanded_image_area' in self.coords:
+                if rect is not None:
                     # 設定済みの範囲を使用
-                    area = self.coords['expanded_image_area']
-                    left = area['top_left'][0]
-                    top = area['top_left'][1]
-                    capture_width = area['width']
-                    capture_height = area['height']
+                    left, top, capture_width, capture_height = rect
                     
-                    self.logger.info(f"設定済み範囲を使用: ({left}, {top}, {capture_width}, {capture_height})")
+                    self.logger.info("設定済み範囲を使用: (%s, %s, %s, %s)", left, top, capture_width, capture_height)
                     
                     # マルチディスプレイ対応スクリーンショット
                     screenshot = screenshot_helper.capture_region(left, top, capture_width, capture_height)
@@ -559,20 +975,17 @@ class MercariResearcher:
                     self.logger.warning("拡大画像エリアが未設定のため、全画面キャプチャを使用")
                     self.logger.info("座標設定を推奨: python tools/coordinate_mapper.py でメニュー8を選択")
                     
-                    screenshot = pyautogui.screenshot()
-                
-                # 画像保存
-                screenshot.save(filepath)
+                    screenshot = screenshot_helper.capture_screen()
                 
                 # モーダルを閉じる（ESCキー）
+                modal = self.rpa.snapshot_region(rect) if rect is not None else None
                 pyautogui.press('escape')
-                time.sleep(1)  # 閉じる処理待機
+                self.wait_for_screen_change(rect, modal, timeout=1)  # 閉じる処理待機
                 
-                self.logger.info(f"拡大画像保存: {filepath}")
-                return str(filepath)
+                return screenshot
             else:
                 self.logger.warning("product_image_main座標が設定されていません")
-                return ""
+                return None
                 
         except Exception as e:
             self.logger.error(f"拡大画像キャプチャエラー: {e}")
@@ -581,11 +994,13 @@ class MercariResearcher:
                 pyautogui.press('escape')
             except:
                 pass
-            return ""
+            return None
 
-    def extract_seller_info(self) -> Dict:
+    def extract_seller_info(self, defer_ocr: bool = False) -> Dict:
         """
         販売者情報を抽出
+        Args:
+            defer_ocr: Trueなら評価のOCRを行わず、画像を'rating_image'に格納
         Returns:
             販売者情報の辞書
         """
@@ -596,7 +1011,7 @@ class MercariResearcher:
         
         try:
             # OS別コマンドキー取得
-            cmd_key = self.human.get_cmd_key()
+            cmd_key = self._cmd_key
             
             # 販売者名
             if 'seller_name' in self.coords:
@@ -604,13 +1019,13 @@ class MercariResearcher:
                     self.coords['seller_name'][0], 
                     self.coords['seller_name'][1]
                 )
-                time.sleep(0.3)
-                pyautogui.hotkey(cmd_key, 'c')  # OS別対応
-                time.sleep(0.3)
-                seller_info['name'] = pyperclip.paste().strip()
+                seller_info['name'] = self.copy_selection(cmd_key).strip()
             
-            # 評価
-            if 'seller_rating' in self.coords:
+            # 評価（同じ販売者の評価を記憶済みならキャプチャ・OCRを省く）
+            rating = self._cached_rating(seller_info.get('name'))
+            if rating is not None:
+                seller_info['rating'] = rating
+            elif 'seller_rating' in self.coords:
                 # OCRで評価を読み取る
                 left = self.coords['seller_rating'][0] - 50
                 top = self.coords['seller_rating'][1] - 20
@@ -619,17 +1034,11 @@ class MercariResearcher:
                 
                 # マルチディスプレイ対応スクリーンショット
                 screenshot = screenshot_helper.capture_region(left, top, width, height)
-                temp_path = 'temp_rating.png'
-                screenshot.save(temp_path)
-                
-                rating_text = self.ocr.extract_text(temp_path)
-                seller_info['rating'] = rating_text
-                
-                # 一時ファイル削除
-                try:
-                    Path(temp_path).unlink()
-                except:
-                    pass
+                if defer_ocr:
+                    seller_info['rating_image'] = screenshot
+                else:
+                    seller_info['rating'] = self._ocr_image(screenshot, 'jpn+eng')
+                    self._remember_rating(seller_info.get('name'), seller_info['rating'])
                     
         except Exception as e:
             self.logger.error(f"販売者情報抽出エラー: {e}")
@@ -656,14 +1065,19 @@ class MercariResearcher:
             if 'next_page' in self.coords:
                 # ボタンが有効か確認
                 if self.rpa.wait_for_element(self.coords['next_page'], timeout=5):
+                    # 先頭商品の表示が前ページから切り替わった時点で待機を終える
+                    region = None
+                    before = None
+                    if 'product_grid_1' in self.coords:
+                        x, y = self.coords['product_grid_1']
+                        region = (x - 50, y - 50, 100, 100)
+                        before = self.rpa.snapshot_region(region)
                     self.human.move_and_click(self.coords['next_page'])
-                    time.sleep(3)
+                    self.wait_for_screen_change(region, before, timeout=3)
                     
                     # 新しい商品が読み込まれたか確認
                     if 'product_grid_1' in self.coords:
-                        return self.rpa.wait_for_element(
-                            self.coords['product_grid_1'], timeout=10
-                        )
+                        return self.wait_for_results()
             
             return False
             
@@ -730,32 +1144,37 @@ class MercariResearcher:
             
         self.logger.info(f"スプレッドシートに{len(products)}件保存")
         
-        for product in products:
-            try:
-                # データ整形
-                row_data = [
-                    '',  # A列: キーワード（カテゴリー検索なので空）
-                    str(product.get('monthly_estimate', 0)),  # B列: 予想販売数/月
-                    str(product.get('price', 0)),  # C列: メルカリ相場
-                    '',  # D列: 検索結果URL（カテゴリー検索）
-                    product.get('url', ''),  # E列: 商品URL
-                    '',  # F列: 画像検索URL（後で追加）
-                    '',  # G列: 仕入URL（後で追加）
-                    '',  # H列: 仕入価格（後で追加）
-                    '',  # I列: MOQ（後で追加）
-                    '',  # J列: 重量（後で追加）
-                    '',  # K列: サイズ（後で追加）
-                    '',  # L列: 配送方法（後で追加）
-                    '',  # M列: 利益率（後で計算）
-                    '',  # N列: 月間利益（後で計算）
-                    'リサーチ済'  # O列: ステータス
-                ]
-                
-                # スプレッドシートに追加
-                self.spreadsheet.append_row(row_data)
-                self.logger.debug(f"保存: {product['title'][:30]}...")
-                time.sleep(1)  # API制限対策
-                
-            except Exception as e:
-                self.logger.error(f"スプレッドシート保存エラー: {e}")
-                continue
\ No newline at end of file
+        rows = [self._product_to_row(product) for product in products]
+        
+        # スプレッドシートに1回の貼り付けでまとめて追加
+        try:
+            self.spreadsheet.append_rows(rows)
+        except Exception as e:
+            self.logger.error(f"スプレッドシート保存エラー: {e}")
+
+    @staticmethod
+    def _product_to_row(product: Dict) -> List[str]:
+        """
+        商品情報をスプレッドシートの1行（A〜O列）に整形
+        Args:
+            product: 商品情報
+        Returns:
+            セル値のリスト
+        """
+        return [
+            '',  # A列: キーワード（カテゴリー検索なので空）
+            str(product.get('monthly_estimate', 0)),  # B列: 予想販売数/月
+            str(product.get('price', 0)),  # C列: メルカリ相場
+            '',  # D列: 検索結果URL（カテゴリー検索）
+            product.get('url', ''),  # E列: 商品URL
+            '',  # F列: 画像検索URL（後で追加）
+            '',  # G列: 仕入URL（後で追加）
+            '',  # H列: 仕入価格（後で追加）
+            '',  # I列: MOQ（後で追加）
+            '',  # J列: 重量（後で追加）
+            '',  # K列: サイズ（後で追加）
+            '',  # L列: 配送方法（後で追加）
+            '',  # M列: 利益率（後で計算）
+            '',  # N列: 月間利益（後で計算）
+            'リサーチ済'  # O列: ステータス
+        ]
@@ -0,0 +1,62 @@
+"""
+ブラウザタブ情報取得モジュール
+Chromeのリモートデバッグ用HTTPエンドポイント（/json/list）から開いているタブのURL・タイトルを取得
+Chromeを --remote-debugging-port=9222 付きで起動し、環境変数 CHROME_DEBUG_PORT=9222 を設定した場合のみ有効
+"""
+import json
+import os
+import re
+import urllib.request
+from typing import Dict, Optional
+
+from utils.logger import setup_logger
+
+# ページタイトル末尾のサイト名（「商品名 - メルカリ」）
+TITLE_SUFFIX_RE = re.compile(r'\s*[-|｜]\s*メルカリ[^-|｜]*$')
+
+
+class BrowserTabs:
+    """
+    タブ情報取得クラス
+    クリップボードを使わずに表示中の商品ページのURL・タイトルを読む
+    """
+
+    def __init__(self, port: Optional[int] = None, timeout: float = 0.5):
+        """
+        初期化
+        Args:
+            port: リモートデバッグのポート（Noneなら環境変数 CHROME_DEBUG_PORT、未設定なら無効）
+            timeout: HTTP問い合わせのタイムアウト（秒）
+        """
+        self.logger = setup_logger(__name__)
+        if port is None and os.environ.get('CHROME_DEBUG_PORT'):
+            port = int(os.environ['CHROME_DEBUG_PORT'])
+        self.url = f'http://127.0.0.1:{port}/json/list' if port else None
+        self.timeout = timeout
+
+    @property
+    def enabled(self) -> bool:
+        """リモートデバッグが設定されているか"""
+        return self.url is not None
+
+    def find_page(self, url_part: str) -> Optional[Dict]:
+        """
+        URLに url_part を含むタブを1つだけ探す
+        Args:
+            url_part: URLに含まれる文字列（例: '/item/'）
+        Returns:
+            {'url': ..., 'title': ...}。無効・該当なし・複数該当時はNone
+        """
+        if self.url is None:
+            return None
+        try:
+            with urllib.request.urlopen(self.url, timeout=self.timeout) as res:
+                targets = json.load(res)
+        except Exception as e:
+            self.logger.debug(f"タブ一覧取得エラー: {e}")
+            return None
+
+        pages = [t for t in targets if t.get('type') == 'page' and url_part in t.get('url', '')]
+        if len(pages) != 1:
+            return None
+        return {'url': pages[0]['url'], 'title': TITLE_SUFFIX_RE.sub('', pages[0].get('title', ''))}
@@ -0,0 +1,20 @@
+"""
+座標設定読み込みモジュール
+config/coordinate_sets/*.json の読み込みをキャッシュ
+"""
+from functools import lru_cache
+
+from utils.json_io import load_json
+
+
+@lru_cache(maxsize=None)
+def load_coord_json(path: str) -> dict:
+    """
+    座標設定JSONを読み込み（同一パスは2回目以降キャッシュを返す）
+    座標を再設定した後は load_coord_json.cache_clear() を呼ぶこと
+    Args:
+        path: 座標設定ファイルのパス
+    Returns:
+        座標辞書（共有オブジェクトのため変更しないこと）
+    """
+    return load_json(path)
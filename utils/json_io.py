@@ -0,0 +1,69 @@
+"""
+JSON読み書きモジュール
+orjsonが使える場合はorjson、無い場合は標準jsonで読み書き
+"""
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson未導入時は標準jsonで代替
+    orjson = None
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    JSONファイルを読み込み
+    Args:
+        path: ファイルパス
+    Returns:
+        読み込んだデータ
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json(data: Any, path: Union[str, Path], indent: bool = True):
+    """
+    JSONファイルに書き込み（UTF-8、日本語はエスケープしない）
+    datetime・numpyスカラーはそのまま渡してよい
+    Args:
+        data: 書き込むデータ
+        path: ファイルパス
+        indent: 2スペースでインデントするか
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=_default, option=option))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2 if indent else None, ensure_ascii=False, default=_default)
+
+
+def _default(obj: Any) -> Any:
+    """標準で変換できない型（numpyスカラー・datetime等）を変換"""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps_json(data: Any) -> str:
+    """
+    1行のJSON文字列に変換（JSONLの1レコード用、日本語はエスケープしない）
+    Args:
+        data: 変換するデータ
+    Returns:
+        改行を含まないJSON文字列
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, default=_default)
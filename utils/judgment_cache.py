@@ -0,0 +1,239 @@
+"""
+画像判別結果キャッシュモジュール
+キャプチャ画像のハッシュをキーに判別結果をSQLiteへ保存し、同一画像の再判別を省く
+"""
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from utils.json_io import dumps_json
+from utils.logger import setup_logger
+
+try:
+    import xxhash
+except ImportError:  # xxhash未導入時はhashlibで代替
+    xxhash = None
+
+# キャッシュの保存先
+CACHE_FILE = Path('data/cache/judgment.sqlite')
+
+# テーブル構成の版（変更時は既存テーブルを作り直す）
+SCHEMA_VERSION = 3
+
+# 判別結果の保持期間（秒）と、DBの使用容量の上限（超えたら古い結果から削除）
+JUDGMENT_TTL = 30 * 24 * 3600
+MAX_CACHE_BYTES = 1024 ** 3
+
+# 容量確認の間隔（保存件数）と、上限超過時に1回で削除する割合
+EVICT_CHECK_INTERVAL = 200
+EVICT_FRACTION = 0.1
+
+# 個人出品者とみなすNG判定の回数（1回の誤判定で除外しないよう複数回で確定）
+PERSONAL_SELLER_MIN_NG = 2
+
+# 販売者の判定の有効期間（秒。最後のNG判定からこの期間を過ぎたら数え直す）
+SELLER_TTL = 7 * 24 * 3600
+
+# 個人出品者として確定済みでも画像判別し直す割合（誤判定で除外され続けないように）
+SELLER_RECHECK_RATE = 0.1
+
+
+class JudgmentCache:
+    """
+    判別結果キャッシュクラス
+    SQLite接続はロックで直列化して複数スレッドから共有する
+    """
+
+    def __init__(self, path: Union[str, Path] = CACHE_FILE, version: str = ''):
+        """
+        初期化
+        Args:
+            path: SQLiteファイルのパス
+            version: 判定ロジック・設定の版（ImageAnalyzer.cache_version）。前回と異なれば判別結果を破棄
+        """
+        self.logger = setup_logger(__name__)
+        self.conn = None
+        self.lock = threading.Lock()
+        self._puts_since_check = 0
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._setup_tables(version)
+        except Exception as e:
+            self.logger.warning(f"判別キャッシュを使用しません: {e}")
+            self.conn = None
+
+    def _setup_tables(self, version: str):
+        """
+        テーブルを作成し、版の異なる結果と期限切れの結果を削除
+        Args:
+            version: 判定ロジック・設定の版
+        """
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            # 旧構成のテーブルは移行せず作り直す
+            self.conn.execute('DROP TABLE IF EXISTS judgment')
+            self.conn.execute('DROP TABLE IF EXISTS seller')
+            self.conn.execute('DROP TABLE IF EXISTS meta')
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS judgment '
+            '(key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS judgment_created ON judgment (created_at)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seller '
+            '(name TEXT PRIMARY KEY, ng_count INTEGER NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != version:
+            if row is not None:
+                self.logger.info("判定ロジックまたは設定が変わったため判別キャッシュを破棄")
+            # 販売者の判定も同じ判別結果から数えたものなので合わせて破棄
+            self.conn.execute('DELETE FROM judgment')
+            self.conn.execute('DELETE FROM seller')
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+        now = time.time()
+        self.conn.execute('DELETE FROM judgment WHERE created_at < ?', (now - JUDGMENT_TTL,))
+        self.conn.execute('DELETE FROM seller WHERE updated_at < ?', (now - SELLER_TTL,))
+        self.conn.commit()
+
+    @staticmethod
+    def key_for(image: np.ndarray) -> str:
+        """
+        画像配列からキャッシュキーを作成
+        Args:
+            image: 画像配列
+        Returns:
+            16進数のハッシュ文字列（サイズを含む）
+        """
+        data = np.ascontiguousarray(image)
+        if xxhash is not None:
+            digest = xxhash.xxh3_64(data).hexdigest()
+        else:
+            digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        return f"{'x'.join(map(str, data.shape))}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        キャッシュ済みの判別結果を取得
+        Args:
+            key: key_for で作成したキー
+        Returns:
+            判別結果（未登録ならNone）
+        """
+        if self.conn is None:
+            return None
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    'SELECT result FROM judgment WHERE key = ? AND created_at >= ?',
+                    (key, time.time() - JUDGMENT_TTL)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            self.logger.debug(f"判別キャッシュ読み込みエラー: {e}")
+            return None
+
+    def put(self, key: str, result: Dict):
+        """
+        判別結果を保存
+        Args:
+            key: key_for で作成したキー
+            result: 判別結果
+        """
+        if self.conn is None:
+            return
+        try:
+            data = dumps_json(result)
+            with self.lock:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO judgment (key, result, created_at) VALUES (?, ?, ?)',
+                    (key, data, time.time())
+                )
+                self._puts_since_check += 1
+                if self._puts_since_check >= EVICT_CHECK_INTERVAL:
+                    self._puts_since_check = 0
+                    self._evict_if_full()
+                self.conn.commit()
+        except Exception as e:
+            self.logger.debug(f"判別キャッシュ保存エラー: {e}")
+
+    def _evict_if_full(self):
+        """使用容量が MAX_CACHE_BYTES を超えていれば古い判別結果から削除（lock取得済みで呼ぶ）"""
+        page_size = self.conn.execute('PRAGMA page_size').fetchone()[0]
+        page_count = self.conn.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = self.conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if (page_count - free_pages) * page_size <= MAX_CACHE_BYTES:
+            return
+        
+        # 削除で空いたページは以降の保存で再利用されるため、ファイルは上限付近で頭打ちになる
+        rows = self.conn.execute('SELECT COUNT(*) FROM judgment').fetchone()[0]
+        count = max(1, int(rows * EVICT_FRACTION))
+        self.conn.execute(
+            'DELETE FROM judgment WHERE key IN '
+            '(SELECT key FROM judgment ORDER BY created_at LIMIT ?)',
+            (count,)
+        )
+        self.logger.info(f"判別キャッシュが上限を超えたため古い結果を{count}件削除")
+
+    def is_personal_seller(self, name: str) -> bool:
+        """
+        個人出品者として確定済みか
+        （SELLER_TTL 以内にNG判定が PERSONAL_SELLER_MIN_NG 回以上続き、OK判定なし）
+        確定済みでも SELLER_RECHECK_RATE の割合でFalseを返し、画像判別をやり直させる
+        Args:
+            name: 販売者名（メルカリ上で一意ではないため、期限と再判別で誤除外を抑える）
+        Returns:
+            確定済みならTrue
+        """
+        if self.conn is None or not name:
+            return False
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    'SELECT ng_count FROM seller WHERE name = ? AND updated_at >= ?',
+                    (name, time.time() - SELLER_TTL)
+                ).fetchone()
+            if row is None or row[0] < PERSONAL_SELLER_MIN_NG:
+                return False
+            return random.random() >= SELLER_RECHECK_RATE
+        except Exception as e:
+            self.logger.debug(f"販売者キャッシュ読み込みエラー: {e}")
+            return False
+
+    def record_seller(self, name: str, is_business: bool):
+        """
+        販売者の判別結果を記録（OK判定なら記録を消し、NG判定なら回数を加算）
+        前回のNG判定から SELLER_TTL を過ぎていれば回数を1から数え直す
+        Args:
+            name: 販売者名
+            is_business: 画像判別の結果
+        """
+        if self.conn is None or not name:
+            return
+        try:
+            now = time.time()
+            with self.lock:
+                if is_business:
+                    self.conn.execute('DELETE FROM seller WHERE name = ?', (name,))
+                else:
+                    self.conn.execute(
+                        'INSERT INTO seller (name, ng_count, updated_at) VALUES (?, 1, ?) '
+                        'ON CONFLICT(name) DO UPDATE SET '
+                        'ng_count = CASE WHEN updated_at < ? THEN 1 ELSE ng_count + 1 END, '
+                        'updated_at = excluded.updated_at',
+                        (name, now, now - SELLER_TTL)
+                    )
+                self.conn.commit()
+        except Exception as e:
+            self.logger.debug(f"販売者キャッシュ保存エラー: {e}")
@@ -2,6 +2,8 @@
 OCR処理モジュール
 pytesseractを使用したテキスト抽出
 """
+import re
+import threading
 import pytesseract
 import cv2
 import numpy as np
@@ -10,6 +12,25 @@ from pathlib import Path
 from typing import Optional, List
 from utils.logger import setup_logger
 
+try:
+    import tesserocr
+except ImportError:  # tesserocr未導入時はpytesseract（呼び出し毎にtesseractを起動）で代替
+    tesserocr = None
+
+# 数値部分
+NUMBER_RE = re.compile(r'\d+')
+
+# 価格パターン（円、¥、コンマ区切りなど。先頭から優先）
+PRICE_RES = tuple(re.compile(p) for p in (
+    r'[¥￥]\s*([0-9,]+)',
+    r'([0-9,]+)\s*円',
+    r'([0-9,]+)\s*[¥￥]',
+    r'(\d{1,3}(?:,\d{3})*)'
+))
+
+# 言語モデルを常駐させたエンジンを使えるか（使える場合はOCR専用ワーカープロセスで実行する）
+RESIDENT_ENGINE = tesserocr is not None
+
 class OCRReader:
     """
     OCRリーダークラス
@@ -19,6 +40,9 @@ class OCRReader:
         """初期化"""
         self.logger = setup_logger(__name__)
         
+        # tesserocrのエンジンはスレッド間で共有できないため、スレッド・言語ごとに保持
+        self._local = threading.local()
+        
         # Tesseractのパス設定（OS別）
         try:
             import platform
@@ -58,22 +82,46 @@ class OCRReader:
         Returns:
             抽出されたテキスト
         """
+        # 画像読み込み
+        image = cv2.imread(image_path)
+        if image is None:
+            self.logger.error(f"画像読み込み失敗: {image_path}")
+            return ""
+        return self._extract(image, lang)
+    
+    def extract_text_from_image(self, image, lang: str = 'jpn+eng') -> str:
+        """
+        メモリ上の画像からテキストを抽出（ファイルを経由しない）
+        Args:
+            image: PIL.Image またはBGR配列
+            lang: 認識言語（jpn+eng = 日本語+英語）
+        Returns:
+            抽出されたテキスト
+        """
+        try:
+            if isinstance(image, Image.Image):
+                # PNG保存→cv2.imread と同じBGR配列に変換
+                image = np.ascontiguousarray(np.asarray(image.convert('RGB'))[:, :, ::-1])
+        except Exception as e:
+            self.logger.error(f"OCRエラー: {e}")
+            return ""
+        return self._extract(image, lang)
+    
+    def _extract(self, image: np.ndarray, lang: str) -> str:
+        """
+        BGR配列を前処理・OCR・クリーンアップ
+        Args:
+            image: BGR配列
+            lang: 認識言語
+        Returns:
+            抽出されたテキスト
+        """
         try:
-            # 画像読み込み
-            image = cv2.imread(image_path)
-            if image is None:
-                self.logger.error(f"画像読み込み失敗: {image_path}")
-                return ""
-            
             # 前処理
             processed_image = self.preprocess_image(image)
             
             # OCR実行
-            text = pytesseract.image_to_string(
-                processed_image, 
-                lang=lang,
-                config='--psm 6'
-            )
+            text = self._recognize(processed_image, lang)
             
             # テキストクリーンアップ
             cleaned_text = self.clean_text(text)
@@ -85,6 +133,42 @@ class OCRReader:
             self.logger.error(f"OCRエラー: {e}")
             return ""
     
+    def _recognize(self, image: np.ndarray, lang: str) -> str:
+        """
+        前処理済み画像を文字認識（--psm 6 相当）
+        Args:
+            image: 前処理済み画像
+            lang: 認識言語
+        Returns:
+            認識結果の生テキスト
+        """
+        api = self._get_engine(lang)
+        if api is None:
+            return pytesseract.image_to_string(image, lang=lang, config='--psm 6')
+        api.SetImage(Image.fromarray(image))
+        return api.GetUTF8Text()
+    
+    def _get_engine(self, lang: str):
+        """
+        言語モデルを読み込み済みのtesserocrエンジンを取得（初回のみ作成）
+        Args:
+            lang: 認識言語
+        Returns:
+            PyTessBaseAPI（tesserocr未導入・初期化失敗時はNone）
+        """
+        if tesserocr is None:
+            return None
+        engines = getattr(self._local, 'engines', None)
+        if engines is None:
+            engines = self._local.engines = {}
+        if lang not in engines:
+            try:
+                engines[lang] = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.SINGLE_BLOCK)
+            except Exception as e:
+                self.logger.warning(f"tesserocr初期化失敗のためpytesseractを使用: {e}")
+                engines[lang] = None
+        return engines[lang]
+    
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
         画像前処理
@@ -139,10 +223,9 @@ class OCRReader:
         Returns:
             抽出された数値のリスト
         """
-        import re
         text = self.extract_text(image_path)
         # 数値パターンの抽出
-        numbers = re.findall(r'\d+', text)
+        numbers = NUMBER_RE.findall(text)
         return numbers
     
     def extract_price(self, image_path: str) -> Optional[int]:
@@ -153,19 +236,10 @@ class OCRReader:
         Returns:
             抽出された価格
         """
-        import re
         text = self.extract_text(image_path)
         
-        # 価格パターン（円、¥、コンマ区切りなど）
-        price_patterns = [
-            r'[¥￥]\s*([0-9,]+)',
-            r'([0-9,]+)\s*円',
-            r'([0-9,]+)\s*[¥￥]',
-            r'(\d{1,3}(?:,\d{3})*)'
-        ]
-        
-        for pattern in price_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in PRICE_RES:
+            matches = pattern.findall(text)
             for match in matches:
                 try:
                     # コンマを除去して数値化
@@ -175,4 +249,30 @@ class OCRReader:
                 except ValueError:
                     continue
         
-        return None
\ No newline at end of file
+        return None
+
+
+# =========================================
+# OCR専用ワーカープロセス用（ProcessPoolExecutorのinitializer/タスク）
+# =========================================
+_worker_reader: Optional[OCRReader] = None
+
+
+def init_ocr_worker():
+    """ワーカープロセスでOCRリーダーを1度だけ初期化（言語モデルはプロセス内に常駐）"""
+    global _worker_reader
+    _worker_reader = OCRReader()
+
+
+def ocr_in_worker(image: np.ndarray, lang: str = 'jpn+eng') -> str:
+    """
+    ワーカープロセス内のOCRリーダーでBGR配列からテキストを抽出
+    Args:
+        image: BGR配列
+        lang: 認識言語
+    Returns:
+        抽出されたテキスト
+    """
+    if _worker_reader is None:
+        init_ocr_worker()
+    return _worker_reader.extract_text_from_image(image, lang=lang)
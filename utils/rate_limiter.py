@@ -0,0 +1,68 @@
+"""
+レート制限モジュール
+トークンバケットでページ遷移などの頻度を平均化して制限
+"""
+import random
+import threading
+import time
+from typing import Iterator
+
+
+class TokenBucket:
+    """
+    トークンバケット
+    per秒あたりrate回まで許可し、最大rate回までの連続実行を許す
+    """
+
+    def __init__(self, rate: int, per: float):
+        """
+        初期化
+        Args:
+            rate: per秒あたりの許可回数（バケット容量）
+            per: 期間（秒）
+        """
+        self.capacity = float(rate)
+        self.fill_rate = rate / per
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """経過時間分のトークンを補充"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+        self.updated_at = now
+
+    def acquire(self) -> float:
+        """
+        トークンを1つ消費（不足していれば補充されるまで待機）
+        Returns:
+            待機した秒数
+        """
+        with self.lock:
+            self._refill()
+            wait = 0.0
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.fill_rate
+                time.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            return wait
+
+
+def backoff_delays(base: float = 2.0, factor: float = 2.0, max_tries: int = 4,
+                   jitter: bool = True) -> Iterator[float]:
+    """
+    指数バックオフの待機秒数を順に返す（base, base*factor, ...）
+    Args:
+        base: 初回の待機秒数
+        factor: 待機秒数の増加倍率
+        max_tries: 返す回数
+        jitter: Trueなら各待機秒数を0.5〜1.0倍にばらつかせる
+    Returns:
+        待機秒数のイテレータ
+    """
+    delay = base
+    for _ in range(max_tries):
+        yield delay * random.uniform(0.5, 1.0) if jitter else delay
+        delay *= factor
@@ -9,6 +9,7 @@ macOS Retina + Windows両対応
 """
 import platform
 import subprocess
+import threading
 import pyautogui
 from PIL import Image
 import tempfile
@@ -17,6 +18,11 @@ import time
 from typing import Optional, Tuple
 import logging
 
+try:
+    import mss
+except ImportError:  # mss未導入時はOS別の従来方式で撮影
+    mss = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +39,9 @@ class ScreenshotHelper:
         # Retinaスケール検出（Mac用）
         self.retina_scale = self._detect_retina_scale() if self.is_mac else 1
         
+        # mssインスタンスはスレッド間で共有できないため、スレッドごとに保持
+        self._local = threading.local()
+        
         logger.info(f"ScreenshotHelper初期化: OS={self.os_type}, Retina Scale={self.retina_scale}")
     
     def _detect_retina_scale(self) -> int:
@@ -73,6 +82,11 @@ class ScreenshotHelper:
         Returns:
             PIL.Image オブジェクト
         """
+        if mss is not None and use_native:
+            image = self._capture_mss(left, top, width, height)
+            if image is not None:
+                return image
+        
         if self.is_mac and use_native:
             return self._capture_mac_native(left, top, width, height)
         elif self.is_windows and use_native:
@@ -81,6 +95,46 @@ class ScreenshotHelper:
             # フォールバック：pyautogui使用
             return self._capture_pyautogui(left, top, width, height)
     
+    def _capture_mss(self, left: int, top: int, width: int, height: int) -> Optional[Image.Image]:
+        """
+        mssによるキャプチャ（XShm / CoreGraphics / BitBlt を直接使用、一時ファイル不要）
+        全ディスプレイを通した座標で指定でき、Retinaでは物理解像度で取得される
+        """
+        try:
+            raw = self._get_sct().grab({'left': left, 'top': top, 'width': width, 'height': height})
+            logger.debug(f"mss capture成功: {width}x{height} at ({left},{top})")
+            return Image.frombytes('RGB', raw.size, raw.bgra, 'raw', 'BGRX')
+            
+        except Exception as e:
+            logger.warning(f"mss captureエラー、従来方式を使用: {e}")
+            return None
+    
+    def _get_sct(self):
+        """呼び出し元スレッドのmssインスタンスを取得（初回のみ作成）"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+    
+    def capture_screen(self) -> Image.Image:
+        """
+        メインディスプレイ全体のスクリーンショットを取得（pyautogui.screenshot() と同じ範囲）
+        
+        Returns:
+            PIL.Image オブジェクト
+        """
+        if mss is not None:
+            try:
+                monitor = self._get_sct().monitors[1]
+                image = self._capture_mss(monitor['left'], monitor['top'],
+                                          monitor['width'], monitor['height'])
+                if image is not None:
+                    return image
+            except Exception as e:
+                logger.warning(f"mss全画面captureエラー、pyautoguiを使用: {e}")
+        return pyautogui.screenshot()
+    
     def _capture_mac_native(self, left: int, top: int, width: int, height: int) -> Image.Image:
         """
         macOS screencapture コマンドを使用した範囲指定キャプチャ